@@ -0,0 +1,69 @@
+# conftest.py
+"""
+Shared pytest setup for the tools/test_*.py suites.
+Puts the project root on sys.path and loads .env once per session (per worker
+under pytest-xdist).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(ROOT / ".env")
+except ImportError:
+    pass
+
+# Runnable scripts that match python_files = "*_test.py" but are not test modules
+collect_ignore = ["tools/simple_browser_test.py", "tools/start_avatar_test.py"]
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-network", action="store_true", default=False,
+                     help="run tests marked network (live external API calls)")
+    parser.addoption("--full-tts", action="store_true", default=False,
+                     help="with --run-network, also synthesize speech instead of only checking keys")
+    parser.addoption("--record-network", action="store_true", default=False,
+                     help="save payloads fetched by network tests to disk")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-network"):
+        return
+    skip_network = pytest.mark.skip(reason="needs --run-network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _ensure_dirs():
+    """Create the logs/snapshots tree once for the whole session."""
+    from core.watchdog import SNAPSHOTS_DIR
+    SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+@pytest.fixture(scope="session")
+def env():
+    """Plain-dict snapshot of os.environ (with .env applied) for config checks."""
+    return dict(os.environ)
+
+
+@pytest.fixture(scope="session")
+def repair_engine():
+    """The RepairEngine singleton, wired up once for the session."""
+    from core.repair_engine import get_repair_engine
+    return get_repair_engine()
+
+
+@pytest.fixture(scope="session")
+def watchdog():
+    """The Watchdog singleton, wired up once for the session."""
+    from core.watchdog import get_watchdog
+    return get_watchdog()
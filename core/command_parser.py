@@ -51,6 +51,17 @@ PHONETIC_FIXES = {
     "tipe": "type",
 }
 
+# normalize_text patterns, compiled once
+# Single letters separated by spaces: 3-5 letters, then any 2-letter leftovers
+_SPACED_LETTERS_RE = re.compile(r'\b([a-z])\s+([a-z])\s+([a-z])(?:\s+([a-z]))?(?:\s+([a-z]))?\b')
+_SPACED_PAIR_RE = re.compile(r'\b([a-z])\s+([a-z])\b')
+_PUNCT_RE = re.compile(r'[^\w\s\-]')
+_MULTI_SPACE_RE = re.compile(r'\s+')
+
+
+def _collapse_letters(match):
+    return ''.join(g for g in match.groups() if g)
+
 
 def normalize_text(text: str) -> str:
     """
@@ -67,17 +78,10 @@ def normalize_text(text: str) -> str:
     text = text.lower().strip()
     
     # Collapse spaced-out single letters (e.g., "T A N K" -> "tank")
-    # Pattern: single letters separated by spaces
-    spaced_pattern = r'\b([a-z])\s+([a-z])\s+([a-z])(?:\s+([a-z]))?(?:\s+([a-z]))?\b'
-    
-    def collapse_letters(match):
-        letters = [g for g in match.groups() if g]
-        return ''.join(letters)
-    
-    text = re.sub(spaced_pattern, collapse_letters, text)
+    text = _SPACED_LETTERS_RE.sub(_collapse_letters, text)
     
     # Also handle 2-letter spacing
-    text = re.sub(r'\b([a-z])\s+([a-z])\b', lambda m: m.group(1) + m.group(2), text)
+    text = _SPACED_PAIR_RE.sub(_collapse_letters, text)
     
     # Apply phonetic fixes
     words = text.split()
@@ -88,8 +92,8 @@ def normalize_text(text: str) -> str:
     text = ' '.join(fixed_words)
     
     # Remove extra punctuation but keep basic structure
-    text = re.sub(r'[^\w\s\-]', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _PUNCT_RE.sub(' ', text)
+    text = _MULTI_SPACE_RE.sub(' ', text).strip()
     
     return text
 
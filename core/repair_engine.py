@@ -174,11 +174,13 @@ class RepairEngine:
                 self._asr.model_name = os.getenv("STT_MODEL_CPU", "small")
                 
                 # Force CPU in faster-whisper
+                from speech.cpu_threads import CPU_THREADS
                 from faster_whisper import WhisperModel
                 self._asr.model = WhisperModel(
                     self._asr.model_name,
                     device="cpu",
-                    compute_type="int8"
+                    compute_type="int8",
+                    cpu_threads=CPU_THREADS
                 )
                 self._asr._ready_for_ptt = True
                 
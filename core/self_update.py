@@ -13,8 +13,11 @@ import os
 import sys
 import subprocess
 import shutil
+import tarfile
 import zipfile
 import argparse
+import heapq
+import importlib.util
 import json
 import time
 import threading
@@ -30,6 +33,14 @@ load_dotenv()
 
 from core.watchdog import log_self_heal, SNAPSHOTS_DIR
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Snapshot archive formats: zstd-compressed tar when zstandard is installed, zip otherwise
+BACKUP_SUFFIXES = (".tar.zst", ".zip")
+
 # ===========================================
 # CONFIGURATION FROM .env
 # ===========================================
@@ -164,14 +175,15 @@ def prune_old_snapshots():
     """Keep only the most recent N snapshots."""
     try:
         SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
-        all_snapshots = sorted(
-            [p for p in SNAPSHOTS_DIR.iterdir() if p.is_file() and p.suffix == ".zip"],
-            key=lambda p: p.stat().st_mtime,
-            reverse=True
-        )
-        for old in all_snapshots[SELF_UPDATE_KEEP_SNAPSHOTS:]:
-            old.unlink()
-            log_update(f"Pruned old snapshot: {old.name}")
+        with os.scandir(SNAPSHOTS_DIR) as it:
+            zips = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith(BACKUP_SUFFIXES) and e.is_file()]
+        # Only the newest N need ranking (O(n log N)); everything else goes
+        keep = set(heapq.nlargest(SELF_UPDATE_KEEP_SNAPSHOTS, zips))
+        for entry in zips:
+            if entry not in keep:
+                old = Path(entry[1])
+                old.unlink()
+                log_update(f"Pruned old snapshot: {old.name}")
     except Exception as e:
         log_update(f"Prune error: {e}", "WARN")
 
@@ -188,7 +200,8 @@ def upload_snapshot(backup_path: str) -> bool:
             headers["Authorization"] = f"Bearer {SELF_UPDATE_UPLOAD_TOKEN}"
         
         with open(backup_path, "rb") as f:
-            files = {"file": (Path(backup_path).name, f, "application/zip")}
+            content_type = "application/zstd" if backup_path.endswith(".tar.zst") else "application/zip"
+            files = {"file": (Path(backup_path).name, f, content_type)}
             resp = requests.post(SELF_UPDATE_UPLOAD_URL, files=files, headers=headers, timeout=120)
         
         if resp.status_code in (200, 201):
@@ -283,21 +296,39 @@ class SelfUpdater:
         log_json("update_check", {"changed_count": len(changed), "remote": remote_sha[:8] if remote_sha else ""})
         return len(changed) > 0, changed, remote_sha[:8] if remote_sha else ""
 
-    def create_backup(self) -> str:
-        """Create full backup zip of repository."""
+    def _backup_files(self):
+        """Yield (path, relative path) for every file that goes into a backup."""
+        skip_dirs = ["venv", "__pycache__", ".git", "logs", "node_modules", "snapshots"]
+        for file in self._repo_root.rglob("*"):
+            rel = file.relative_to(self._repo_root)
+            if any(d in str(rel) for d in skip_dirs):
+                continue
+            if file.is_file():
+                yield file, rel
+
+    def create_backup(self, fast: bool = False) -> str:
+        """
+        Create full backup of repository: a zstd-compressed tar when zstandard
+        is installed, else a zip. fast=True writes an uncompressed zip (tests).
+        """
         SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = SNAPSHOTS_DIR / f"{ts}_repo_backup.zip"
+        use_zstd = zstandard is not None and not fast
+        backup_path = SNAPSHOTS_DIR / f"{ts}_repo_backup{'.tar.zst' if use_zstd else '.zip'}"
 
         log_update(f"Creating backup: {backup_path}")
 
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for file in self._repo_root.rglob("*"):
-                rel = file.relative_to(self._repo_root)
-                skip_dirs = ["venv", "__pycache__", ".git", "logs", "node_modules", "snapshots"]
-                if any(d in str(rel) for d in skip_dirs):
-                    continue
-                if file.is_file():
+        if use_zstd:
+            # Streamed: tar writes straight into the compressor, nothing buffered whole
+            with open(backup_path, "wb") as raw, \
+                    zstandard.ZstdCompressor(level=3).stream_writer(raw) as zst, \
+                    tarfile.open(fileobj=zst, mode="w|") as tar:
+                for file, rel in self._backup_files():
+                    tar.add(file, arcname=rel.as_posix(), recursive=False)
+        else:
+            compression = zipfile.ZIP_STORED if fast else zipfile.ZIP_DEFLATED
+            with zipfile.ZipFile(backup_path, 'w', compression) as zf:
+                for file, rel in self._backup_files():
                     zf.write(file, rel)
 
         # Metadata
@@ -328,9 +359,16 @@ class SelfUpdater:
 
         log_update(f"Running {len(existing_tests)} test files")
 
+        # -x: one failure already rejects the update, so don't wait for the rest
+        cmd = [sys.executable, "-m", "pytest", "-q", "-x"]
+        # Spread the test files across cores when pytest-xdist is installed;
+        # loadscope keeps each module (and its fixtures) on one worker
+        if importlib.util.find_spec("xdist") is not None:
+            cmd += ["-n", "auto", "--dist=loadscope"]
+
         try:
             result = subprocess.run(
-                [sys.executable, "-m", "pytest", "-q"] + existing_tests,
+                cmd + existing_tests,
                 cwd=self._repo_root,
                 capture_output=True,
                 text=True,
@@ -380,8 +418,18 @@ class SelfUpdater:
                 log_update(f"Backup not found", "ERROR")
                 return False
 
-            with zipfile.ZipFile(backup, 'r') as zf:
-                zf.extractall(self._repo_root)
+            if backup.name.endswith(".tar.zst"):
+                if zstandard is None:
+                    raise RuntimeError("zstandard is required to restore .tar.zst backups")
+                # "data" filter (where available) refuses paths outside the repo
+                extract_args = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+                with open(backup, "rb") as raw, \
+                        zstandard.ZstdDecompressor().stream_reader(raw) as zst, \
+                        tarfile.open(fileobj=zst, mode="r|") as tar:
+                    tar.extractall(self._repo_root, **extract_args)
+            else:
+                with zipfile.ZipFile(backup, 'r') as zf:
+                    zf.extractall(self._repo_root)
 
             log_update("Rollback complete")
             log_json("rollback_done", {"backup": backup_path})
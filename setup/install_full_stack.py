@@ -47,7 +47,7 @@ def install_python_packages():
         
         # Speech
         "faster-whisper",
-        "pyaudio",
+        "sounddevice",
         "pygame",
         
         # Vision
@@ -155,19 +155,15 @@ def check_vb_cable():
     
     # Check for VB-Cable in audio devices
     try:
-        import pyaudio
-        p = pyaudio.PyAudio()
+        import sounddevice as sd
         
         vb_found = False
-        for i in range(p.get_device_count()):
-            info = p.get_device_info_by_index(i)
+        for info in sd.query_devices():
             if 'CABLE' in info['name'].upper() or 'VB-AUDIO' in info['name'].upper():
                 print(f"  ✓ VB-Cable found: {info['name']}")
                 vb_found = True
                 break
         
-        p.terminate()
-        
         if not vb_found:
             print("  VB-Audio Cable not found.")
             print("  Download from: https://vb-audio.com/Cable/")
@@ -72,7 +72,9 @@ except ImportError:
     webrtcvad = None
     VAD_AVAILABLE = False
 
-# faster-whisper
+# faster-whisper (thread env must be set before it loads OpenMP)
+from speech.cpu_threads import CPU_THREADS
+
 try:
     from faster_whisper import WhisperModel
 
@@ -219,6 +221,7 @@ class ASREngine:
         # Recording state
         self._recording = False
         self._frames = []
+        self._frames_captured = 0  # Counted by the audio callback, reset per recording
         self._record_start_time = None
         self._last_audio_time = None
         self._lock = threading.Lock()
@@ -250,7 +253,9 @@ class ASREngine:
             print(f"[ASR] Loading {self.model_name} on {self.device} ({self.compute_type})...")
             log_debug(f"Loading model: {self.model_name} on {self.device}")
             start = time.time()
-            self.model = WhisperModel(self.model_name, device=self.device, compute_type=self.compute_type)
+            self.model = WhisperModel(
+                self.model_name, device=self.device, compute_type=self.compute_type, cpu_threads=CPU_THREADS
+            )
             elapsed = time.time() - start
             print(f"[ASR] Model loaded successfully ({elapsed:.1f}s)")
             log_debug(f"Model loaded in {elapsed:.1f}s")
@@ -265,7 +270,7 @@ class ASREngine:
                 self.compute_type = "int8"
                 self.model_name = STT_MODEL_CPU
                 try:
-                    self.model = WhisperModel(self.model_name, device="cpu", compute_type="int8")
+                    self.model = WhisperModel(self.model_name, device="cpu", compute_type="int8", cpu_threads=CPU_THREADS)
                     print(f"[ASR] CPU fallback model loaded: {self.model_name}")
                 except Exception as e2:
                     print(f"[ASR] CPU fallback failed: {e2}")
@@ -284,6 +289,7 @@ class ASREngine:
         """Callback for audio stream - captures frames while recording."""
         if self._recording:
             self._frames.append(indata.copy())
+            self._frames_captured += 1
             self._last_audio_time = time.time()
 
             # Check max duration
@@ -371,6 +377,10 @@ class ASREngine:
         """Check if ready to accept new PTT."""
         return self._ready_for_ptt and not self._recording
 
+    def frames_captured(self) -> int:
+        """Audio blocks captured since the current recording started (safe from any thread)."""
+        return self._frames_captured
+
     def start_recording(self) -> bool:
         """Start recording audio (PTT pressed or toggle on)."""
         with self._lock:
@@ -379,6 +389,7 @@ class ASREngine:
                 return False
 
             self._frames = []
+            self._frames_captured = 0
             self._record_start_time = time.time()
             self._last_audio_time = time.time()
             self._ready_for_ptt = False
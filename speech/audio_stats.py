@@ -0,0 +1,55 @@
+"""Single-pass level statistics for int16 audio buffers."""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+
+def _rms_peak_numpy(x):
+    if x.shape[0] == 0:
+        return 0.0, 0
+    # Accumulate in int64 without materialising a widened copy of x
+    ss = int(np.einsum("i,i->", x, x, dtype=np.int64))
+    peak = max(int(x.max()), -int(x.min()))
+    return math.sqrt(ss / x.shape[0]), peak
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def _rms_peak_jit(x):
+        n = x.shape[0]
+        if n == 0:
+            return 0.0, 0
+        ss = 0
+        pk = 0
+        for i in range(n):
+            # Widen before squaring: int16 * int16 overflows
+            v = np.int64(x[i])
+            a = -v if v < 0 else v
+            if a > pk:
+                pk = a
+            ss += v * v
+        return math.sqrt(ss / n), pk
+
+
+def rms_peak_i16(x):
+    """
+    RMS and absolute peak of a 1-D int16 buffer in one pass.
+
+    Uses a Numba kernel when numba is installed, NumPy otherwise.
+    Returns (rms: float, peak: int).
+    """
+    x = np.ascontiguousarray(x).reshape(-1)
+    if NUMBA_AVAILABLE:
+        rms, peak = _rms_peak_jit(x)
+        return float(rms), int(peak)
+    return _rms_peak_numpy(x)
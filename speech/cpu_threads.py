@@ -0,0 +1,37 @@
+"""
+CPU thread settings for faster-whisper (CTranslate2).
+
+Must be imported BEFORE faster_whisper: the OpenMP runtime reads these
+variables once, when it is first loaded. Whisper on CPU runs fastest with
+one thread per physical core; SMT siblings only add contention.
+
+Override with STT_CPU_THREADS, or by setting OMP_NUM_THREADS directly.
+"""
+
+import os
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def physical_cores() -> int:
+    """Number of physical CPU cores (assumes 2-way SMT without psutil)."""
+    if psutil is not None:
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    return max(1, (os.cpu_count() or 8) // 2)
+
+
+def configure_cpu_threads() -> int:
+    """Set OpenMP/MKL thread env vars (without overriding the user's) and return the count."""
+    threads = os.getenv("STT_CPU_THREADS") or str(physical_cores())
+    os.environ.setdefault("OMP_NUM_THREADS", threads)
+    os.environ.setdefault("MKL_NUM_THREADS", os.environ["OMP_NUM_THREADS"])
+    os.environ.setdefault("KMP_AFFINITY", "granularity=fine,compact,1,0")
+    return int(os.environ["OMP_NUM_THREADS"])
+
+
+CPU_THREADS = configure_cpu_threads()
@@ -1,31 +1,53 @@
-﻿import pyaudio
-import wave
+﻿import wave
 import os
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import sounddevice as sd
+
+from speech.cpu_threads import CPU_THREADS  # before faster_whisper loads OpenMP
 from faster_whisper import WhisperModel
 
+from speech.audio_stats import rms_peak_i16
+
 TEMP_AUDIO = os.path.join(os.path.dirname(__file__), "temp_audio.wav")
+PTT_MAX_SECONDS = int(os.getenv("PTT_MAX_SECONDS", "300"))
+# Utterances quieter than this (int16 RMS) are treated as silence
+STT_SILENCE_RMS = float(os.getenv("STT_SILENCE_RMS", "100"))
+# Long recordings are decoded in windows of this length while still capturing
+STREAM_WINDOW_SECONDS = 30
 
 class SpeechToText:
     def __init__(self, model_size="base"):
         print("Loading Whisper model (this may take a moment on first run)...")
-        self.model = WhisperModel(model_size, device="cpu", compute_type="int8")
+        self.model = WhisperModel(model_size, device="cpu", compute_type="int8", cpu_threads=CPU_THREADS)
         print("Whisper model loaded!")
 
         # PTT state
         self._recording = False
-        self._frames = []
         self._stream = None
-        self._pya = None
         self._lock = threading.Lock()
-        self._record_thread = None
-        self._stop_event = threading.Event()
 
         # Audio settings
         self._chunk = 1024
         self._rate = 16000
         self._channels = 1
-        self._format = pyaudio.paInt16
+
+        # Capture buffer: preallocated for the longest allowed recording,
+        # filled in place by the stream callback (no per-block bytes copies)
+        self._buf = np.zeros(self._rate * PTT_MAX_SECONDS, dtype=np.int16)
+        self._n = 0
+
+        # Streamed decoding: full windows are handed to a worker as soon as
+        # they are captured; only the tail is left to decode after stop
+        self._window = self._rate * STREAM_WINDOW_SECONDS
+        self._window_start = 0
+        self._window_futures = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-window")
+        # Bumped per recording (and when one is discarded); queued or running
+        # windows from an older generation stop decoding
+        self._generation = 0
         
         # Test microphone on init
         self._test_microphone()
@@ -33,108 +55,157 @@ class SpeechToText:
     def _test_microphone(self):
         """Test that microphone is accessible."""
         try:
-            p = pyaudio.PyAudio()
-            default = p.get_default_input_device_info()
+            default = sd.query_devices(kind='input')
             print(f"[STT] Default mic: {default['name']} (index {default['index']})")
-            p.terminate()
         except Exception as e:
             print(f"[STT] WARNING - Microphone test failed: {e}")
 
     def start_recording(self):
-        """Start continuous recording in background thread."""
+        """Start continuous recording via a sounddevice input stream."""
         with self._lock:
             if self._recording:
                 print("[STT] Already recording!")
                 return False
 
-            self._frames = []
-            self._stop_event.clear()
+            self._n = 0
+            self._window_start = 0
+            self._window_futures = []
+            self._generation += 1
             
             try:
-                self._pya = pyaudio.PyAudio()
-                self._stream = self._pya.open(
-                    format=self._format,
+                self._stream = sd.InputStream(
+                    samplerate=self._rate,
+                    blocksize=self._chunk,
+                    dtype='int16',
                     channels=self._channels,
-                    rate=self._rate,
-                    input=True,
-                    frames_per_buffer=self._chunk
+                    callback=self._cb
                 )
                 self._recording = True
-
-                # Start background thread to continuously capture audio
-                self._record_thread = threading.Thread(target=self._capture_loop, daemon=True)
-                self._record_thread.start()
+                self._stream.start()
 
                 print("[STT] Recording started...")
                 return True
             except Exception as e:
                 print(f"[STT] Failed to start recording: {e}")
-                if self._pya:
+                self._recording = False
+                if self._stream:
                     try:
-                        self._pya.terminate()
+                        self._stream.close()
                     except:
                         pass
+                    self._stream = None
                 return False
 
-    def _capture_loop(self):
-        """Continuously capture audio frames while recording."""
-        frame_count = 0
-        while not self._stop_event.is_set():
-            try:
-                data = self._stream.read(self._chunk, exception_on_overflow=False)
-                with self._lock:
-                    if self._recording:
-                        self._frames.append(data)
-                        frame_count += 1
-            except Exception as e:
-                print(f"[STT] Capture error: {e}")
-                break
-        print(f"[STT] Capture loop ended, captured {frame_count} frames")
+    def _cb(self, indata, frames, time_info, status):
+        """Stream callback: copy the block straight into the capture buffer."""
+        if not self._recording:
+            return
+        n = self._n
+        frames = min(frames, len(self._buf) - n)
+        if frames <= 0:
+            return
+        self._buf[n:n + frames] = indata[:frames, 0]
+        self._n = n + frames
+
+        if self._n - self._window_start >= self._window:
+            end = self._window_start + self._window
+            # Copy: the buffer is reused (overwritten) by the next recording
+            self._window_futures.append(
+                self._executor.submit(self._transcribe_window,
+                                      self._buf[self._window_start:end].copy(), self._generation)
+            )
+            self._window_start = end
+
+    def _transcribe_window(self, samples, generation):
+        """Decode one captured window independently (no prompt carried across windows)."""
+        if generation != self._generation:
+            return ""  # Recording was discarded or superseded
+        audio = samples.astype(np.float32) / 32768.0
+        segments, info = self.model.transcribe(
+            audio,
+            beam_size=5,
+            chunk_length=STREAM_WINDOW_SECONDS,
+            condition_on_previous_text=False,
+            no_speech_threshold=0.6
+        )
+        # Segments decode lazily: stop between them if the recording went stale
+        texts = []
+        for segment in segments:
+            if generation != self._generation:
+                return ""
+            texts.append(segment.text.strip())
+        return " ".join(texts)
+
+    def _finish_streamed(self, n_samples):
+        """Decode the tail and join it with the windows decoded during capture."""
+        futures = self._window_futures
+        self._window_futures = []
+        if n_samples > self._window_start:
+            futures.append(self._executor.submit(self._transcribe_window,
+                                                 self._buf[self._window_start:n_samples].copy(),
+                                                 self._generation))
+
+        print(f"[STT] Finishing streamed transcription ({len(futures)} windows)...")
+        try:
+            parts = [future.result() for future in futures]
+        except Exception as e:
+            print(f"[STT] Transcription error: {e}")
+            return ""
+
+        result = " ".join(part for part in parts if part).strip()
+        print(f"[STT] Transcribed: '{result}'")
+        return result
 
     def stop_recording_and_transcribe(self):
         """Stop recording and transcribe captured audio."""
-        frames_copy = []
-
         with self._lock:
             if not self._recording:
                 print("[STT] Not recording!")
                 return ""
 
-            # Signal stop and wait for thread
-            self._stop_event.set()
             self._recording = False
-            frames_copy = self._frames.copy()
-            print(f"[STT] Stopping recording, got {len(frames_copy)} frames")
 
-        # Wait for capture thread to finish
-        if self._record_thread:
-            self._record_thread.join(timeout=1.0)
-
-        # Clean up stream
+        # Clean up stream (stop() waits for any in-flight callback)
         try:
             if self._stream:
-                self._stream.stop_stream()
+                self._stream.stop()
                 self._stream.close()
-            if self._pya:
-                self._pya.terminate()
         except Exception as e:
             print(f"[STT] Cleanup error: {e}")
+        self._stream = None
+
+        n_samples = self._n
+        print(f"[STT] Stopping recording, got {n_samples // self._chunk} frames")
 
         # Write captured audio to file
-        if len(frames_copy) < 5:
-            print(f"[STT] Too few frames ({len(frames_copy)}), need at least 5")
+        if n_samples < 5 * self._chunk:
+            print(f"[STT] Too few frames ({n_samples // self._chunk}), need at least 5")
             return ""
+
+        rms, peak = rms_peak_i16(self._buf[:n_samples])
+        if rms < STT_SILENCE_RMS:
+            print(f"[STT] Silence (rms={rms:.0f}, peak={peak}), skipping transcription")
+            # cancel() only drops queued windows; the generation bump also
+            # makes a window that is already decoding bail out
+            self._generation += 1
+            for future in self._window_futures:
+                future.cancel()
+            self._window_futures = []
+            return ""
+
+        if self._window_futures:
+            return self._finish_streamed(n_samples)
             
         try:
             wf = wave.open(TEMP_AUDIO, 'wb')
             wf.setnchannels(self._channels)
             wf.setsampwidth(2)  # 16-bit
             wf.setframerate(self._rate)
-            wf.writeframes(b''.join(frames_copy))
+            wf.writeframes(self._buf[:n_samples])
             wf.close()
             
             file_size = os.path.getsize(TEMP_AUDIO)
-            duration = len(frames_copy) * self._chunk / self._rate
+            duration = n_samples / self._rate
             print(f"[STT] Saved {file_size} bytes ({duration:.1f}s audio), transcribing...")
         except Exception as e:
             print(f"[STT] Write error: {e}")
@@ -145,27 +216,19 @@ class SpeechToText:
     def record_audio(self, duration=5):
         """Synchronous recording for legacy compatibility."""
         print(f"Recording for {duration} seconds...")
-        p = pyaudio.PyAudio()
-        stream = p.open(
-            format=self._format,
+        recording = sd.rec(
+            int(self._rate * duration),
+            samplerate=self._rate,
             channels=self._channels,
-            rate=self._rate,
-            input=True,
-            frames_per_buffer=self._chunk
+            dtype='int16'
         )
-        frames = []
-        for _ in range(0, int(self._rate / self._chunk * duration)):
-            data = stream.read(self._chunk)
-            frames.append(data)
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+        sd.wait()
 
         wf = wave.open(TEMP_AUDIO, 'wb')
         wf.setnchannels(self._channels)
-        wf.setsampwidth(p.get_sample_size(self._format))
+        wf.setsampwidth(2)  # 16-bit
         wf.setframerate(self._rate)
-        wf.writeframes(b''.join(frames))
+        wf.writeframes(recording)
         wf.close()
         print("Recording complete!")
 
@@ -3,9 +3,11 @@
 
 import os
 import io
+import hashlib
 import requests
 import threading
 import time
+from pathlib import Path
 
 try:
     import pygame
@@ -13,6 +15,20 @@ try:
 except ImportError:
     pygame = None
 
+try:
+    from mutagen.mp3 import MP3
+except ImportError:
+    MP3 = None
+
+# Native SAPI (pywin32) for viseme-driven lip sync
+try:
+    import pythoncom
+    import win32com.client
+    SAPI_AVAILABLE = True
+except ImportError:
+    pythoncom = None
+    SAPI_AVAILABLE = False
+
 from avatar import avatar_ws_client
 
 # Configuration
@@ -21,6 +37,136 @@ ELEVEN_KEY = os.getenv('ELEVENLABS_API_KEY')
 VOICE_ID = os.getenv('ELEVENLABS_VOICE_ID', '21m00Tcm4TlvDq8ikWAM')
 MODEL_ID = "eleven_multilingual_v2"
 
+# SpVoice flags / event masks (SpeechVoiceSpeakFlags, SpeechVoiceEvents)
+SVSF_ASYNC = 1
+SVE_END_INPUT_STREAM = 4
+SVE_VISEME = 256
+SAPI_VISEME_MAX = 22.0  # SAPI visemes are numbered 0 (silence) to 21
+
+# On-disk cache of synthesized ElevenLabs audio (repeat phrases skip the API)
+TTS_CACHE_DIR = Path(os.getenv('TTS_CACHE_DIR', '~/.cache/aida/tts')).expanduser()
+TTS_CACHE_MAX_MB = float(os.getenv('TTS_CACHE_MAX_MB', '100'))
+
+# Posted by pygame.mixer.music when a track finishes playing
+MUSIC_END_EVENT = pygame.USEREVENT + 1 if pygame else None
+
+
+class _MusicEndPump:
+    """Wait for pygame's music end event on a daemon thread and signal it."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._ready = threading.Event()  # Set once the pump thread has initialized
+        self._lock = threading.Lock()
+        self._thread = None
+        self.available = pygame is not None
+
+    def start(self):
+        """Start the pump once; returns False if the event queue is unusable."""
+        with self._lock:
+            if self._thread is None and self.available:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._ready.wait(timeout=5.0)
+        return self.available and self._ready.is_set()
+
+    def _run(self):
+        # SDL only delivers events to the thread that initialized video, so
+        # the display is set up here, on the thread that waits
+        try:
+            if not pygame.display.get_init():
+                pygame.display.init()
+            # Only the end event reaches the queue; nothing else is consumed
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(MUSIC_END_EVENT)
+            pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
+        except Exception as e:
+            print(f"[TTS] Music end events unavailable, polling instead: {e}")
+            self.available = False
+            self._ready.set()
+            return
+        self._ready.set()
+        while True:
+            try:
+                event = pygame.event.wait()
+            except Exception:
+                self.available = False
+                self._done.set()
+                return
+            if event.type == MUSIC_END_EVENT:
+                self._done.set()
+
+    def arm(self):
+        self._done.clear()
+
+    def wait(self, timeout):
+        return self._done.wait(timeout)
+
+
+_end_pump = _MusicEndPump()
+
+
+def _audio_duration(path, audio_data):
+    """Exact MP3 length via mutagen, falling back to a byte-size estimate."""
+    if MP3 is not None:
+        try:
+            return MP3(path).info.length
+        except Exception:
+            pass
+    return max(2, len(audio_data) / 15000)
+
+
+def _cache_path(text):
+    """Cache file for text, keyed by voice, model and a hash of the text."""
+    key = hashlib.sha256(f"{VOICE_ID}|{MODEL_ID}|{text}".encode('utf-8')).hexdigest()
+    return TTS_CACHE_DIR / f"{key}.mp3"
+
+
+def _cache_get(text):
+    """Return cached audio bytes for text, or None on a miss."""
+    path = _cache_path(text)
+    try:
+        audio_data = path.read_bytes()
+        # Bump access time explicitly; many filesystems mount with noatime
+        os.utime(path)
+        return audio_data
+    except OSError:
+        return None
+
+
+def _cache_put(text, audio_data):
+    """Store audio for text and evict least recently used files over the cap."""
+    try:
+        TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_path(text).write_bytes(audio_data)
+
+        entries = []
+        total = 0
+        for entry in os.scandir(TTS_CACHE_DIR):
+            if entry.is_file() and entry.name.endswith('.mp3'):
+                st = entry.stat()
+                entries.append((st.st_atime, st.st_size, entry.path))
+                total += st.st_size
+
+        limit = TTS_CACHE_MAX_MB * 1024 * 1024
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            os.unlink(path)
+            total -= size
+    except OSError as e:
+        print(f"[TTS] Cache write failed: {e}")
+
+
+class _SapiEvents:
+    """SpVoice event sink: opens the avatar mouth per viseme as it is spoken."""
+
+    avatar = None
+
+    def OnViseme(self, stream_number, stream_position, duration, next_viseme, feature, current_viseme):
+        if self.avatar is not None:
+            self.avatar.set_mouth_open(current_viseme / SAPI_VISEME_MAX)
+
 
 class TextToSpeech:
     def __init__(self):
@@ -67,6 +213,11 @@ class TextToSpeech:
 
         # Use ElevenLabs
         try:
+            audio_data = _cache_get(text)
+            if audio_data is not None:
+                self._play_audio_with_lipsync(audio_data)
+                return
+
             url = f'https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}'
             headers = {
                 'xi-api-key': ELEVEN_KEY,
@@ -90,6 +241,7 @@ class TextToSpeech:
                 return
 
             audio_data = resp.content
+            _cache_put(text, audio_data)
             self._play_audio_with_lipsync(audio_data)
 
         except Exception as e:
@@ -109,14 +261,20 @@ class TextToSpeech:
         try:
             if pygame:
                 pygame.mixer.music.load(temp_path)
-                duration = max(2, len(audio_data) / 15000)
+                duration = _audio_duration(temp_path, audio_data)
 
                 anim_thread = threading.Thread(target=self._animate_mouth_loop, args=(duration,))
                 anim_thread.start()
 
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
+                if _end_pump.start():
+                    _end_pump.arm()
+                    pygame.mixer.music.play()
+                    if not _end_pump.wait(timeout=duration + 1):
+                        pygame.mixer.music.stop()  # End event never came; don't overrun
+                else:
+                    pygame.mixer.music.play()
+                    while pygame.mixer.music.get_busy():
+                        time.sleep(0.1)
 
                 self._speaking = False
                 anim_thread.join(timeout=1)
@@ -136,8 +294,36 @@ class TextToSpeech:
             except:
                 pass
 
+    def _sapi_speak(self, text):
+        """Speak through native SAPI, lip-syncing from its viseme events."""
+        pythoncom.CoInitialize()
+        try:
+            voice = win32com.client.Dispatch("SAPI.SpVoice")
+            if self.avatar.is_ready():
+                voice.EventInterests = SVE_VISEME | SVE_END_INPUT_STREAM
+                events = win32com.client.WithEvents(voice, _SapiEvents)
+                events.avatar = self.avatar
+
+            self._speaking = True
+            voice.Speak(text[:500], SVSF_ASYNC)
+            # Events are delivered through this thread's message queue
+            while not voice.WaitUntilDone(20):
+                pythoncom.PumpWaitingMessages()
+        finally:
+            self._speaking = False
+            if self.avatar.is_ready():
+                self.avatar.set_mouth_open(0)
+            pythoncom.CoUninitialize()
+
     def _fallback_speak(self, text):
         """Windows SAPI fallback."""
+        if SAPI_AVAILABLE:
+            try:
+                self._sapi_speak(text)
+                return
+            except Exception as e:
+                print(f"[TTS] SAPI error, using PowerShell: {e}")
+
         import subprocess
         self._speaking = True
 
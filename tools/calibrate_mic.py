@@ -19,6 +19,8 @@ except ImportError:
     print("ERROR: sounddevice not installed. Run: pip install sounddevice")
     sys.exit(1)
 
+from speech.audio_stats import rms_peak_i16
+
 SAMPLE_RATE = 16000
 DURATION = 3  # seconds to measure
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "mic.json")
@@ -40,11 +42,8 @@ def measure_ambient_noise(duration: float = 3.0) -> dict:
     audio = sd.rec(int(duration * SAMPLE_RATE), samplerate=SAMPLE_RATE, channels=1, dtype='int16')
     sd.wait()
     
-    audio = audio.flatten().astype(np.float32)
-    
     # Calculate metrics
-    rms = np.sqrt(np.mean(audio ** 2))
-    peak = np.max(np.abs(audio))
+    rms, peak = rms_peak_i16(audio)
     
     # Determine VAD aggressiveness based on noise level
     # Higher noise = more aggressive VAD filtering
@@ -82,10 +81,7 @@ def test_speech_detection(duration: float = 3.0) -> dict:
     audio = sd.rec(int(duration * SAMPLE_RATE), samplerate=SAMPLE_RATE, channels=1, dtype='int16')
     sd.wait()
     
-    audio = audio.flatten().astype(np.float32)
-    
-    rms = np.sqrt(np.mean(audio ** 2))
-    peak = np.max(np.abs(audio))
+    rms, peak = rms_peak_i16(audio)
     
     return {
         "speech_rms": float(rms),
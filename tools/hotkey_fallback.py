@@ -3,10 +3,12 @@ Python Hotkey Handler - Fallback when AHK doesn't work
 Run this script to enable Ctrl+Alt+H, Ctrl+Alt+Space, Ctrl+Alt+T hotkeys
 """
 import keyboard
-import os
-import sys
-import subprocess
-from pathlib import Path
+import queue
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
 
 print("=" * 50)
 print("PYTHON HOTKEY HANDLER - ACTIVE")
@@ -19,18 +21,27 @@ print("=" * 50)
 print("Press Ctrl+C to exit")
 print()
 
+# Hotkey callbacks run on keyboard's hook thread: only enqueue and return,
+# the main loop below does the (comparatively slow) feedback.
+_events = queue.Queue()
+
+
 def on_ctrl_alt_h():
-    print("[HOTKEY] Ctrl+Alt+H pressed!")
     # You can add your assistant toggle logic here
-    os.system('msg * "Ctrl+Alt+H works! Python hotkey active."')
+    _events.put_nowait("Ctrl+Alt+H")
 
 def on_ctrl_alt_space():
-    print("[HOTKEY] Ctrl+Alt+Space pressed!")
-    os.system('msg * "Ctrl+Alt+Space works! Python hotkey active."')
+    _events.put_nowait("Ctrl+Alt+Space")
 
 def on_ctrl_alt_t():
-    print("[HOTKEY] Ctrl+Alt+T pressed!")
-    os.system('msg * "Ctrl+Alt+T works! Python hotkey active."')
+    _events.put_nowait("Ctrl+Alt+T")
+
+
+def notify(hotkey):
+    """In-process feedback: console line plus a system beep (no popup, no subprocess)."""
+    print(f"[HOTKEY] {hotkey} pressed!")
+    if winsound:
+        winsound.MessageBeep(winsound.MB_ICONASTERISK)
 
 # Register hotkeys
 keyboard.add_hotkey('ctrl+alt+h', on_ctrl_alt_h)
@@ -39,8 +50,12 @@ keyboard.add_hotkey('ctrl+alt+t', on_ctrl_alt_t)
 
 print("Hotkeys registered! Try pressing Ctrl+Alt+H now...")
 
-# Keep running
+# Keep running (timeout lets Ctrl+C through on Windows)
 try:
-    keyboard.wait()
+    while True:
+        try:
+            notify(_events.get(timeout=0.5))
+        except queue.Empty:
+            pass
 except KeyboardInterrupt:
     print("\nExiting hotkey handler...")
@@ -6,38 +6,156 @@ Probes all audio input devices and finds a working one.
 
 import sys
 import os
+import atexit
 import json
+import threading
 import time
 import wave
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import sounddevice as sd
+except ImportError:
+    sd = None  # Installed on demand when run as a script (see __main__)
+
+try:
+    import numpy_rms
+except ImportError:
+    numpy_rms = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to path
 ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT))
+
+from speech.audio_stats import rms_peak_i16
+
 LOGS_DIR = ROOT / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
 # Log file for this run
 LOG_FILE = LOGS_DIR / "self_heal_agent_run.log"
 
+# Device enumeration is slow (PortAudio host API scan); reuse it for this long
+DEVICE_LIST_FILE = LOGS_DIR / "device_list.json"
+DEVICE_LIST_TTL = 300  # seconds
+
+# Non-default input devices are probed concurrently
+PROBE_WORKERS = 4
+# A short capture is enough to tell live audio from silence/dead devices
+PROBE_DURATION = 0.25  # seconds
+PROBE_SAMPLE_RATES = [16000, 22050, 44100, 48000]
+
+# Read once per run, updated in memory by the steps, written once at the end
+ENV_FILE = ROOT / ".env"
+STATE_FILE = ROOT / "core" / "state.json"
+
+# One buffered handle for the whole run; flushed at the MIC_FIX= result and on exit
+_LOG_FH = open(LOG_FILE, "a", buffering=64 * 1024, encoding="utf-8")
+atexit.register(_LOG_FH.close)
+_LOG_LOCK = threading.Lock()  # device probes log from worker threads
+
 
 def log(msg: str):
     """Log to file and console."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     line = f"[{timestamp}] {msg}"
-    print(line)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    with _LOG_LOCK:
+        print(line)
+        _LOG_FH.write(line + "\n")
+
+
+def _write_json(path: Path, data) -> None:
+    """Serialize data to path in a single write (orjson when installed)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def _load_env(text: str) -> dict:
+    """Parse KEY=VALUE lines of a .env file (comments and blanks skipped)."""
+    env = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if sep and key and not key.startswith("#"):
+            env[key] = value.strip()
+    return env
+
+
+def _save_env(env: dict, text: str) -> bool:
+    """
+    Write env back over the original .env text (read with newline=''),
+    touching only changed keys and appending new ones. Line endings are kept
+    as they are (CRLF on Windows). Returns False (and skips the write) if
+    nothing changed.
+    """
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = []
+    seen = set()
+    for line in text.splitlines(keepends=True):
+        body = line.rstrip("\r\n")
+        key, sep, value = body.partition("=")
+        key = key.strip()
+        if sep and key in env:
+            seen.add(key)
+            if value.strip() != env[key]:
+                line = f"{key}={env[key]}{line[len(body):]}"
+        lines.append(line)
+    added = [f"{key}={value}{newline}" for key, value in env.items() if key not in seen]
+    if added and lines and not lines[-1].endswith(("\r", "\n")):
+        lines[-1] += newline
+    
+    content = "".join(lines + added)
+    if content == text:
+        return False
+    # Write beside and rename so readers never see a half-written .env
+    tmp_file = ENV_FILE.with_name(".env.tmp")
+    tmp_file.write_text(content, encoding="utf-8", newline="")
+    os.replace(tmp_file, ENV_FILE)
+    return True
+
+
+def _rms(recording) -> float:
+    """RMS of a recording (int16 reduced in int64 without a float upcast)."""
+    if recording.dtype == np.int16:
+        return rms_peak_i16(recording)[0]
+    rec = np.ascontiguousarray(recording.reshape(-1), dtype=np.float32)
+    if numpy_rms is not None and rec.size:
+        return float(numpy_rms.rms(rec, window_size=rec.size)[0])
+    return float(np.sqrt(np.mean(rec ** 2)))
+
+
+def _load_cached_device_list(ttl: float = DEVICE_LIST_TTL):
+    """Return the saved device list if it is younger than ttl seconds, else None."""
+    try:
+        device_info = json.loads(DEVICE_LIST_FILE.read_text(encoding="utf-8"))
+        age = (datetime.now() - datetime.fromisoformat(device_info["timestamp"])).total_seconds()
+    except (OSError, ValueError, KeyError):
+        return None
+    if not 0 <= age < ttl:
+        return None
+    device_info["from_cache"] = True
+    return device_info
 
 
-def step_2_capture_device_list():
+def step_2_capture_device_list(rescan: bool = False):
     """Step 2: Capture full device list & status."""
     log("=== STEP 2: Capture Device List ===")
     
     try:
-        import sounddevice as sd
+        cached = None if rescan else _load_cached_device_list()
+        if cached:
+            log(f"Using cached device list from {cached['timestamp']} (--rescan to refresh)")
+            return cached
         
         devices = sd.query_devices()
         default_input = sd.default.device[0]
@@ -62,8 +180,7 @@ def step_2_capture_device_list():
             })
         
         # Save to JSON
-        with open(LOGS_DIR / "device_list.json", "w", encoding="utf-8") as f:
-            json.dump(device_info, f, indent=2)
+        _write_json(DEVICE_LIST_FILE, device_info)
         
         log(f"Found {len(devices)} audio devices")
         log(f"Default input device: {default_input}")
@@ -82,95 +199,148 @@ def step_2_capture_device_list():
         return None
 
 
+def _record(idx, sr: int, duration: float, out: np.ndarray):
+    """
+    Record from one device on its own stream (sd.rec/sd.wait share one global
+    stream) straight into `out`, a preallocated (frames, 1) int16 buffer.
+    Returns the filled view of `out`.
+    """
+    frames = min(int(duration * sr), len(out))
+    filled = 0
+    done = threading.Event()
+    
+    def callback(indata, n, time_info, status):
+        nonlocal filled
+        n = min(n, frames - filled)
+        out[filled:filled + n] = indata[:n]
+        filled += n
+        if filled >= frames:
+            done.set()
+            raise sd.CallbackStop
+    
+    with sd.InputStream(samplerate=sr, channels=1, dtype='int16', device=idx, callback=callback):
+        done.wait(timeout=duration + 2.0)
+    return out[:filled]
+
+
+def _probe_one(dev: dict, found: threading.Event = None) -> dict:
+    """Probe a single input device at several sample rates.
+
+    With `found`, sets it on success and stops early once it is set, i.e.
+    another device already works. Without it, every rate is tried.
+    """
+    idx = dev["index"]
+    name = dev["name"]
+    log(f"Probing device [{idx}]: {name}")
+    
+    result = {
+        "index": idx,
+        "name": name,
+        "ok": False,
+        "frames": 0,
+        "rms": 0.0,
+        "error": None,
+        "sample_rates_tried": [],
+    }
+    
+    # Try multiple sample rates: 16kHz first since the ASR feeds the stream to
+    # Whisper unresampled, then the device's native rate (no PortAudio resampler)
+    native = int(dev["default_samplerate"])
+    sample_rates = [PROBE_SAMPLE_RATES[0], native] + [sr for sr in PROBE_SAMPLE_RATES[1:] if sr != native]
+    sample_rates = list(dict.fromkeys(sample_rates))
+    
+    # One buffer, sized for the highest rate, reused for every attempt
+    buf = np.empty((int(PROBE_DURATION * max(sample_rates)), 1), dtype=np.int16)
+    
+    for sr in sample_rates:
+        if found is not None and found.is_set():
+            result["error"] = "Skipped: a working device was already found"
+            log(f"  [{idx}] Skipped, a working device was already found")
+            return result
+        try:
+            log(f"  [{idx}] Trying {sr}Hz...")
+            
+            # Record
+            recording = _record(idx, sr, PROBE_DURATION, buf)
+            
+            # Analyze
+            frames = len(recording)
+            rms = _rms(recording)
+            
+            result["sample_rates_tried"].append({
+                "rate": sr,
+                "frames": frames,
+                "rms": float(rms),
+            })
+            
+            log(f"    [{idx}] Frames: {frames}, RMS: {rms:.1f}")
+            
+            # Check if valid audio (frames > 0 and RMS > noise threshold)
+            if frames > 0 and rms > 5:  # Lower threshold for quiet rooms
+                result["ok"] = True
+                result["frames"] = frames
+                result["rms"] = float(rms)
+                result["working_sample_rate"] = sr
+                if found is not None:
+                    found.set()
+                log(f"  âœ“ Device [{idx}] works at {sr}Hz (RMS: {rms:.1f})")
+                break
+                
+        except Exception as e:
+            result["sample_rates_tried"].append({
+                "rate": sr,
+                "error": str(e),
+            })
+            log(f"    [{idx}] Error at {sr}Hz: {e}")
+    
+    if not result["ok"]:
+        result["error"] = "No valid audio captured at any sample rate"
+        log(f"  âœ— Device [{idx}] failed")
+    
+    return result
+
+
 def step_3_probe_devices(device_info: dict):
     """Step 3: Try programmatic mic test on each candidate device."""
     log("=== STEP 3: Probe Each Input Device ===")
     
-    import sounddevice as sd
-    
-    probe_results = []
-    working_device = None
-    
     input_devices = [d for d in device_info["devices"] if d["is_input"]]
+    results = {}
+    found = threading.Event()
     
+    # The default device is the one most likely shared with other apps:
+    # probe it on its own, then the rest concurrently
     for dev in input_devices:
-        idx = dev["index"]
-        name = dev["name"]
-        log(f"Probing device [{idx}]: {name}")
-        
-        result = {
-            "index": idx,
-            "name": name,
-            "ok": False,
-            "frames": 0,
-            "rms": 0.0,
-            "error": None,
-            "sample_rates_tried": [],
-        }
-        
-        # Try multiple sample rates
-        sample_rates = [16000, 22050, 44100, 48000]
-        
-        for sr in sample_rates:
-            try:
-                duration = 1.5  # seconds
-                log(f"  Trying {sr}Hz...")
-                
-                # Record
-                recording = sd.rec(
-                    int(duration * sr),
-                    samplerate=sr,
-                    channels=1,
-                    dtype='int16',
-                    device=idx,
-                )
-                sd.wait()
-                
-                # Analyze
-                frames = len(recording)
-                rms = np.sqrt(np.mean(recording.astype(np.float32) ** 2))
-                
-                result["sample_rates_tried"].append({
-                    "rate": sr,
-                    "frames": frames,
-                    "rms": float(rms),
-                })
-                
-                log(f"    Frames: {frames}, RMS: {rms:.1f}")
-                
-                # Check if valid audio (frames > 0 and RMS > noise threshold)
-                if frames > 0 and rms > 5:  # Lower threshold for quiet rooms
-                    result["ok"] = True
-                    result["frames"] = frames
-                    result["rms"] = float(rms)
-                    result["working_sample_rate"] = sr
-                    
-                    if working_device is None:
-                        working_device = {
-                            "index": idx,
-                            "name": name,
-                            "sample_rate": sr,
-                            "rms": float(rms),
-                        }
-                        log(f"  âœ“ Device [{idx}] works at {sr}Hz (RMS: {rms:.1f})")
-                    break
-                    
-            except Exception as e:
-                result["sample_rates_tried"].append({
-                    "rate": sr,
-                    "error": str(e),
-                })
-                log(f"    Error at {sr}Hz: {e}")
-        
-        if not result["ok"]:
-            result["error"] = "No valid audio captured at any sample rate"
-            log(f"  âœ— Device [{idx}] failed")
-        
-        probe_results.append(result)
-        
-        # Write incrementally
-        with open(LOGS_DIR / "device_probe.jsonl", "a", encoding="utf-8") as f:
-            f.write(json.dumps(result) + "\n")
+        if dev["is_default_input"]:
+            results[dev["index"]] = _probe_one(dev, found)
+    
+    # A working default skips the rest. Otherwise every other probe runs to
+    # completion (no early stop between them), so which ones succeed does
+    # not depend on thread timing
+    others_found = found if found.is_set() else None
+    others = [d for d in input_devices if not d["is_default_input"]]
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as pool:
+        futures = {pool.submit(_probe_one, dev, others_found): dev["index"] for dev in others}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    
+    # Pick the first working device in list order, as a serial probe would
+    probe_results = [results[d["index"]] for d in input_devices]
+    working_device = None
+    for result in probe_results:
+        if result["ok"]:
+            working_device = {
+                "index": result["index"],
+                "name": result["name"],
+                "sample_rate": result["working_sample_rate"],
+                "rms": result["rms"],
+            }
+            log(f"Selected device [{result['index']}] at {result['working_sample_rate']}Hz")
+            break
+    
+    # Write all probe lines in one go
+    with open(LOGS_DIR / "device_probe.jsonl", "a", encoding="utf-8") as f:
+        f.writelines(json.dumps(result) + "\n" for result in probe_results)
     
     # Summary
     log(f"Probe complete: {sum(1 for r in probe_results if r['ok'])}/{len(probe_results)} devices working")
@@ -183,8 +353,6 @@ def step_4_fallback_attempts():
     log("=== STEP 4: Fallback Attempts ===")
     
     try:
-        import sounddevice as sd
-        
         # Try with different parameters
         fallback_configs = [
             {"samplerate": 16000, "channels": 1, "dtype": "int16"},
@@ -198,7 +366,7 @@ def step_4_fallback_attempts():
             try:
                 rec = sd.rec(int(1.5 * config["samplerate"]), **config)
                 sd.wait()
-                rms = np.sqrt(np.mean(rec.astype(np.float32) ** 2))
+                rms = _rms(rec)
                 if rms > 5:
                     log(f"  âœ“ Fallback worked: RMS={rms:.1f}")
                     return {"ok": True, "config": config, "rms": float(rms)}
@@ -220,8 +388,6 @@ def step_5_check_permissions():
     # But we can try to record and check the error
     
     try:
-        import sounddevice as sd
-        
         # Quick test
         rec = sd.rec(1000, samplerate=16000, channels=1, dtype='int16')
         sd.wait()
@@ -243,74 +409,37 @@ def step_5_check_permissions():
             return {"permission_ok": True, "other_error": str(e)}
 
 
-def step_6_update_config(working_device: dict):
-    """Step 6: Update .env with working device."""
+def step_6_update_config(working_device: dict, env: dict, state: dict):
+    """Step 6: Record the working device in the .env and state dicts."""
     log("=== STEP 6: Update Configuration ===")
     
     if not working_device:
         log("  No working device to configure")
         return False
     
-    env_file = ROOT / ".env"
-    env_content = env_file.read_text(encoding="utf-8") if env_file.exists() else ""
-    
-    # Update or add MIC_DEVICE_INDEX
     idx = working_device["index"]
     sr = working_device.get("sample_rate", 16000)
     
-    if "MIC_DEVICE_INDEX" in env_content:
-        import re
-        env_content = re.sub(r"MIC_DEVICE_INDEX=\d+", f"MIC_DEVICE_INDEX={idx}", env_content)
-    else:
-        env_content += f"\nMIC_DEVICE_INDEX={idx}"
-    
-    if "MIC_SAMPLE_RATE" in env_content:
-        import re
-        env_content = re.sub(r"MIC_SAMPLE_RATE=\d+", f"MIC_SAMPLE_RATE={sr}", env_content)
-    else:
-        env_content += f"\nMIC_SAMPLE_RATE={sr}"
-    
-    env_file.write_text(env_content.strip() + "\n", encoding="utf-8")
+    env["MIC_DEVICE_INDEX"] = str(idx)
+    env["MIC_SAMPLE_RATE"] = str(sr)
     log(f"  Set MIC_DEVICE_INDEX={idx}, MIC_SAMPLE_RATE={sr}")
     
     # Also save to state.json for persistence
-    state_file = ROOT / "core" / "state.json"
-    state = {}
-    if state_file.exists():
-        try:
-            state = json.loads(state_file.read_text())
-        except:
-            pass
-    
     state["mic_device_index"] = idx
     state["mic_sample_rate"] = sr
     state["mic_device_name"] = working_device["name"]
     state["mic_configured_at"] = datetime.now().isoformat()
     
-    state_file.write_text(json.dumps(state, indent=2))
-    log(f"  Saved to core/state.json")
-    
     return True
 
 
-def step_7_test_capture():
+def step_7_test_capture(env: dict):
     """Step 7: Test actual capture with configured device."""
     log("=== STEP 7: Test Audio Capture ===")
     
     try:
-        import sounddevice as sd
-        
-        # Load config
-        env_file = ROOT / ".env"
-        env_content = env_file.read_text() if env_file.exists() else ""
-        
-        # Parse MIC_DEVICE_INDEX
-        import re
-        match = re.search(r"MIC_DEVICE_INDEX=(\d+)", env_content)
-        device_idx = int(match.group(1)) if match else None
-        
-        match = re.search(r"MIC_SAMPLE_RATE=(\d+)", env_content)
-        sample_rate = int(match.group(1)) if match else 16000
+        device_idx = int(env["MIC_DEVICE_INDEX"]) if "MIC_DEVICE_INDEX" in env else None
+        sample_rate = int(env.get("MIC_SAMPLE_RATE", 16000))
         
         log(f"  Testing device {device_idx} at {sample_rate}Hz")
         
@@ -331,9 +460,10 @@ def step_7_test_capture():
             wf.setnchannels(1)
             wf.setsampwidth(2)
             wf.setframerate(sample_rate)
-            wf.writeframes(recording.tobytes())
+            # Hand wave the recording's own buffer instead of a tobytes() copy
+            wf.writeframes(memoryview(recording).cast('B'))
         
-        rms = np.sqrt(np.mean(recording.astype(np.float32) ** 2))
+        rms = _rms(recording)
         log(f"  Saved {wav_path} ({len(recording)} frames, RMS: {rms:.1f})")
         
         return {
@@ -348,20 +478,12 @@ def step_7_test_capture():
         return {"ok": False, "error": str(e)}
 
 
-def step_8_add_circuit_breaker():
+def step_8_add_circuit_breaker(state: dict):
     """Step 8: Add circuit breaker to prevent endless loops."""
     log("=== STEP 8: Circuit Breaker Configuration ===")
     
     # This is handled by the .env settings already
     # But we can add a state flag
-    state_file = ROOT / "core" / "state.json"
-    state = {}
-    if state_file.exists():
-        try:
-            state = json.loads(state_file.read_text())
-        except:
-            pass
-    
     state["circuit_breaker"] = {
         "mic_repair_attempts": 0,
         "max_attempts": 3,
@@ -369,12 +491,11 @@ def step_8_add_circuit_breaker():
         "last_attempt": None,
     }
     
-    state_file.write_text(json.dumps(state, indent=2))
     log("  Circuit breaker state initialized")
     return True
 
 
-def run_full_diagnostics():
+def run_full_diagnostics(rescan: bool = False):
     """Run all diagnostic steps."""
     log("=" * 60)
     log("MICROPHONE DIAGNOSTICS - Starting")
@@ -386,7 +507,7 @@ def run_full_diagnostics():
         probe_file.unlink()
     
     # Step 2: Get device list
-    device_info = step_2_capture_device_list()
+    device_info = step_2_capture_device_list(rescan=rescan)
     if not device_info:
         log("FATAL: Could not enumerate audio devices")
         return {"status": "FAILED", "error": "No audio devices found"}
@@ -394,6 +515,14 @@ def run_full_diagnostics():
     # Step 3: Probe devices
     probe_results, working_device = step_3_probe_devices(device_info)
     
+    # A stale cached list (device unplugged, indices shifted) can make every
+    # probe fail: rescan once before falling back
+    if not working_device and device_info.get("from_cache"):
+        log("No working device in cached list, rescanning...")
+        device_info = step_2_capture_device_list(rescan=True)
+        if device_info:
+            probe_results, working_device = step_3_probe_devices(device_info)
+    
     # Step 4: Fallback if needed
     if not working_device:
         log("No working device found, trying fallbacks...")
@@ -408,19 +537,40 @@ def run_full_diagnostics():
     
     # Step 6: Update config if we have a working device
     if working_device:
-        step_6_update_config(working_device)
+        env_text = ""
+        if ENV_FILE.exists():
+            # newline='': keep CRLF so an unchanged .env compares equal
+            with open(ENV_FILE, encoding="utf-8", newline="") as f:
+                env_text = f.read()
+        env = _load_env(env_text)
+        state = {}
+        if STATE_FILE.exists():
+            try:
+                state = json.loads(STATE_FILE.read_bytes())
+            except:
+                pass
+        
+        step_6_update_config(working_device, env, state)
         
         # Step 7: Test capture
-        test_result = step_7_test_capture()
+        test_result = step_7_test_capture(env)
         
         # Step 8: Circuit breaker
-        step_8_add_circuit_breaker()
+        step_8_add_circuit_breaker(state)
+        
+        if _save_env(env, env_text):
+            log("  Saved .env")
+        else:
+            log("  .env already up to date")
+        _write_json(STATE_FILE, state)
+        log("  Saved to core/state.json")
         
         if test_result.get("ok"):
             log("=" * 60)
             log("MIC_FIX=SUCCESS")
             log(f"Working device: [{working_device['index']}] {working_device['name']}")
             log("=" * 60)
+            _LOG_FH.flush()
             return {
                 "status": "SUCCESS",
                 "device": working_device,
@@ -434,6 +584,7 @@ def run_full_diagnostics():
     log("  2. Close other apps using microphone (Teams, Zoom, etc.)")
     log("  3. Check hardware connection")
     log("=" * 60)
+    _LOG_FH.flush()
     
     return {
         "status": "FAILED",
@@ -443,16 +594,20 @@ def run_full_diagnostics():
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Microphone diagnostics")
+    parser.add_argument("--rescan", action="store_true", help="Ignore the cached device list")
+    args = parser.parse_args()
+    
     # Ensure sounddevice is installed
-    try:
-        import sounddevice
-    except ImportError:
+    if sd is None:
         print("Installing sounddevice...")
         import subprocess
         subprocess.run([sys.executable, "-m", "pip", "install", "sounddevice", "-q"])
-        import sounddevice
+        import sounddevice as sd
     
-    result = run_full_diagnostics()
+    result = run_full_diagnostics(rescan=args.rescan)
     print("\n" + "=" * 60)
     print("RESULT:", json.dumps(result, indent=2))
 
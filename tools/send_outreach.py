@@ -15,15 +15,25 @@ Environment Variables Required for --send:
     OUTREACH_SMTP_PASS   (app password)
 """
 
+import atexit
 import csv
 import os
 import sys
 import argparse
+import asyncio
+import re
 import smtplib
 from email.message import EmailMessage
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 CSV_PATH = BASE_DIR / "assets" / "recruiters.csv"
@@ -40,6 +50,19 @@ SMTP_PASS = os.environ.get("OUTREACH_SMTP_PASS", "")
 
 # Rate limit
 MAX_EMAILS_PER_RUN = 5
+# Concurrent SMTP connections when aiosmtplib is installed
+SMTP_PARALLEL = 3
+
+# Template placeholders and their fallbacks when the CSV lacks the column
+_PLACEHOLDER_RE = re.compile(r"\{(name|company|role)\}")
+_PLACEHOLDER_DEFAULTS = {"name": "Hiring Manager", "company": "your company", "role": ""}
+DEFAULT_SUBJECT = "Open-Source AI Desktop Assistant — Bedanta Chatterjee"
+
+
+# One buffered handle for the whole run; flushed when the session ends and on exit
+LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+_LOG_FH = open(LOG_PATH, "a", buffering=64 * 1024, encoding="utf-8")
+atexit.register(_LOG_FH.close)
 
 
 def log(message: str):
@@ -47,9 +70,7 @@ def log(message: str):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     line = f"[{timestamp}] {message}"
     print(line)
-    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    _LOG_FH.write(line + "\n")
 
 
 def load_template() -> str:
@@ -66,32 +87,32 @@ def load_recruiters() -> list:
         log(f"ERROR: CSV not found: {CSV_PATH}")
         sys.exit(1)
     
-    recruiters = []
-    with open(CSV_PATH, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            recruiters.append(row)
-    return recruiters
+    with open(CSV_PATH, "r", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        return list(csv.DictReader(f))
 
 
-def personalize_email(template: str, recruiter: dict) -> tuple:
-    """Personalize email for recruiter. Returns (subject, body)."""
-    body = template.replace("{name}", recruiter.get("name", "Hiring Manager"))
-    body = body.replace("{company}", recruiter.get("company", "your company"))
-    body = body.replace("{role}", recruiter.get("role", ""))
-    
-    # Extract subject from template (first line starting with Subject:)
-    lines = body.split("\n")
-    subject = "Open-Source AI Desktop Assistant — Bedanta Chatterjee"
+@lru_cache(maxsize=None)
+def _split_template(template: str) -> tuple:
+    """Split template into (subject, body) once; Subject: lines are not part of the body."""
+    lines = template.split("\n")
+    subject = DEFAULT_SUBJECT
     for line in lines:
         if line.startswith("Subject:"):
             subject = line.replace("Subject:", "").strip()
             break
-    
-    # Remove subject line from body
     body = "\n".join(line for line in lines if not line.startswith("Subject:"))
+    return subject, body
+
+
+def personalize_email(template: str, recruiter: dict) -> tuple:
+    """Personalize email for recruiter. Returns (subject, body)."""
+    subject, body = _split_template(template)
+    values = {key: recruiter.get(key, default) for key, default in _PLACEHOLDER_DEFAULTS.items()}
     
-    return subject, body.strip()
+    def fill(match):
+        return values[match.group(1)]
+    
+    return _PLACEHOLDER_RE.sub(fill, subject), _PLACEHOLDER_RE.sub(fill, body).strip()
 
 
 def prepare_emails(recruiters: list, template: str):
@@ -115,55 +136,137 @@ Subject: {subject}
     log(f"Total prepared: {len(recruiters)} emails in {PREPARED_DIR}")
 
 
-def send_email(to_email: str, subject: str, body: str) -> bool:
-    """Send a single email via SMTP."""
-    if not SMTP_USER or not SMTP_PASS:
-        log("ERROR: SMTP credentials not set. Set OUTREACH_SMTP_USER and OUTREACH_SMTP_PASS")
-        return False
-    
+class SMTPSession:
+    """One authenticated SMTP connection reused for a whole batch of emails."""
+
+    def __init__(self):
+        self._server = None
+
+    def _connect(self):
+        self._server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+        self._server.starttls()
+        self._server.login(SMTP_USER, SMTP_PASS)
+
+    def send(self, msg: EmailMessage):
+        """Send msg, (re)connecting if there is no live connection."""
+        if self._server is None:
+            self._connect()
+        else:
+            try:
+                self._server.noop()
+            except smtplib.SMTPServerDisconnected:
+                self._connect()
+        self._server.send_message(msg)
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except smtplib.SMTPException:
+                pass
+            self._server = None
+
+
+def _build_message(to_email: str, subject: str, body: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = SMTP_USER
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.set_content(body)
+    return msg
+
+
+def send_email(session: SMTPSession, to_email: str, subject: str, body: str) -> bool:
+    """Send a single email over an open SMTP session."""
     try:
-        msg = EmailMessage()
-        msg["From"] = SMTP_USER
-        msg["To"] = to_email
-        msg["Subject"] = subject
-        msg.set_content(body)
-        
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASS)
-            server.send_message(msg)
-        
+        session.send(_build_message(to_email, subject, body))
         return True
     except Exception as e:
         log(f"ERROR sending to {to_email}: {e}")
         return False
 
 
+async def _send_parallel(messages: list) -> list:
+    """Send messages over up to SMTP_PARALLEL connections at once; returns per-message success."""
+    results = [False] * len(messages)
+    pending = asyncio.Queue()
+    for item in enumerate(messages):
+        pending.put_nowait(item)
+    
+    async def worker():
+        client = aiosmtplib.SMTP(hostname=SMTP_HOST, port=SMTP_PORT, start_tls=True)
+        try:
+            await client.connect()
+            await client.login(SMTP_USER, SMTP_PASS)
+        except Exception as e:
+            log(f"ERROR connecting to {SMTP_HOST}: {e}")
+            return
+        try:
+            while not pending.empty():
+                i, msg = pending.get_nowait()
+                try:
+                    await client.send_message(msg)
+                    results[i] = True
+                except Exception as e:
+                    log(f"ERROR sending to {msg['To']}: {e}")
+        finally:
+            try:
+                await client.quit()
+            except Exception:
+                pass
+    
+    await asyncio.gather(*(worker() for _ in range(min(SMTP_PARALLEL, len(messages)))))
+    return results
+
+
 def send_emails(recruiters: list, template: str, dry_run: bool = False):
     """Send personalized emails (with rate limiting)."""
     SENT_DIR.mkdir(parents=True, exist_ok=True)
     
-    sent_count = 0
-    for recruiter in recruiters:
-        if sent_count >= MAX_EMAILS_PER_RUN:
-            log(f"Rate limit reached ({MAX_EMAILS_PER_RUN}/run). Run again tomorrow.")
-            break
-        
-        subject, body = personalize_email(template, recruiter)
-        
-        if dry_run:
+    if dry_run:
+        for recruiter in recruiters:
+            personalize_email(template, recruiter)
             log(f"DRY-RUN: Would send to {recruiter['email']}")
-            continue
-        
-        if send_email(recruiter["email"], subject, body):
-            sent_count += 1
-            log(f"SENT: {recruiter['email']} ({sent_count}/{MAX_EMAILS_PER_RUN})")
+        log(f"Session complete. Sent: 0/{len(recruiters)}")
+        return
+    
+    if not SMTP_USER or not SMTP_PASS:
+        log("ERROR: SMTP credentials not set. Set OUTREACH_SMTP_USER and OUTREACH_SMTP_PASS")
+        return
+    
+    # With aiosmtplib, each round sends everything still allowed under the rate
+    # limit concurrently; failed recipients are replaced in the next round
+    pending = iter(recruiters)
+    session = SMTPSession()
+    sent_count = 0
+    try:
+        while sent_count < MAX_EMAILS_PER_RUN:
+            round_size = MAX_EMAILS_PER_RUN - sent_count if aiosmtplib else 1
+            batch = [(r, *personalize_email(template, r)) for r in islice(pending, round_size)]
+            if not batch:
+                break
             
-            # Save copy to sent folder
-            filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{recruiter['company']}.txt"
-            (SENT_DIR / filename).write_text(f"To: {recruiter['email']}\n{body}", encoding="utf-8")
-        else:
-            log(f"FAILED: {recruiter['email']}")
+            if aiosmtplib:
+                messages = [_build_message(r["email"], subject, body) for r, subject, body in batch]
+                results = asyncio.run(_send_parallel(messages))
+            else:
+                results = [send_email(session, r["email"], subject, body) for r, subject, body in batch]
+            
+            for (recruiter, subject, body), ok in zip(batch, results):
+                if ok:
+                    sent_count += 1
+                    log(f"SENT: {recruiter['email']} ({sent_count}/{MAX_EMAILS_PER_RUN})")
+                    
+                    # Save copy to sent folder
+                    filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{recruiter['company']}.txt"
+                    (SENT_DIR / filename).write_text(f"To: {recruiter['email']}\n{body}", encoding="utf-8")
+                else:
+                    log(f"FAILED: {recruiter['email']}")
+    finally:
+        session.close()
+    
+    if sent_count >= MAX_EMAILS_PER_RUN and next(pending, None) is not None:
+        log(f"Rate limit reached ({MAX_EMAILS_PER_RUN}/run). Run again tomorrow.")
     
     log(f"Session complete. Sent: {sent_count}/{len(recruiters)}")
 
@@ -193,6 +296,7 @@ def main():
         log("No action specified. Use --prepare, --send, or --dry-run")
     
     log("Session ended")
+    _LOG_FH.flush()
 
 
 if __name__ == "__main__":
@@ -3,17 +3,43 @@
 
 import os
 import json
+import time
+import atexit
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
 WS_URL = os.getenv("AVATAR_WS_URL", "ws://127.0.0.1:8001")
 
-def test_animation(animation_name="wave"):
-    print(f"Connecting to {WS_URL}...")
-    try:
-        import websocket
-        ws = websocket.create_connection(WS_URL, timeout=5)
+# One connection shared by all tests (a single handshake per run)
+_ws = None
+
+def _get_ws():
+    global _ws
+    if _ws is None:
+        print(f"Connecting to {WS_URL}...")
+        _ws = websocket.create_connection(WS_URL, timeout=5)
         print("Connected.")
+    return _ws
+
+def _close_ws():
+    global _ws
+    if _ws is not None:
+        _ws.close()
+        _ws = None
+
+atexit.register(_close_ws)
+
+def test_animation(animation_name="wave", wait_response=True):
+    if websocket is None:
+        print("websocket-client not installed. Run: pip install websocket-client")
+        return
+    try:
+        ws = _get_ws()
 
         # VTube Studio API format (adjust if using different avatar software)
         payload = {
@@ -28,36 +54,43 @@ def test_animation(animation_name="wave"):
         ws.send(json.dumps(payload))
         print(f"Sent animation trigger: {animation_name}")
 
-        resp = ws.recv()
-        print(f"Response: {resp}")
-        ws.close()
+        if wait_response:
+            resp = ws.recv()
+            print(f"Response: {resp}")
         print("Test complete.")
-    except ImportError:
-        print("websocket-client not installed. Run: pip install websocket-client")
     except Exception as e:
         print(f"Error: {e}")
         print("Make sure VTube Studio is running with WebSocket enabled on the configured port.")
 
-def test_talking_parameter(value=1.0):
-    print(f"Sending talking parameter = {value}...")
+# steps: (value, seconds to wait before sending it) pairs
+# wait_response=False fires and forgets instead of blocking on each reply
+def test_talking_parameter(steps=((1.0, 0.0),), wait_response=True):
+    if websocket is None:
+        print("websocket-client not installed. Run: pip install websocket-client")
+        return
     try:
-        import websocket
-        ws = websocket.create_connection(WS_URL, timeout=5)
-        payload = {
-            "apiName": "VTubeStudioPublicAPI",
-            "apiVersion": "1.0",
-            "requestID": "test_param_1",
-            "messageType": "InjectParameterDataRequest",
-            "data": {
-                "parameterValues": [
-                    {"id": "talking", "value": value}
-                ]
+        ws = _get_ws()
+        for i, (value, delay) in enumerate(steps):
+            time.sleep(delay)
+            print(f"Sending talking parameter = {value}...")
+            payload = {
+                "apiName": "VTubeStudioPublicAPI",
+                "apiVersion": "1.0",
+                "requestID": f"test_param_{i + 1}",
+                "messageType": "InjectParameterDataRequest",
+                "data": {
+                    "parameterValues": [
+                        {"id": "talking", "value": value}
+                    ]
+                }
             }
-        }
-        ws.send(json.dumps(payload))
-        resp = ws.recv()
-        print(f"Response: {resp}")
-        ws.close()
+            ws.send(json.dumps(payload))
+        if not wait_response:
+            return
+        # No recv between sends: drain all responses once everything is out
+        for _ in steps:
+            resp = ws.recv()
+            print(f"Response: {resp}")
     except Exception as e:
         print(f"Error: {e}")
 
@@ -66,7 +99,6 @@ if __name__ == "__main__":
     print("1) Testing animation trigger...")
     test_animation("dance")
     print("\n2) Testing talking parameter...")
-    test_talking_parameter(1.0)
-    import time; time.sleep(1)
-    test_talking_parameter(0.0)
+    # Parameter injection is a side effect only; no acknowledgement needed
+    test_talking_parameter([(1.0, 0.0), (0.0, 1.0)], wait_response=False)
     print("\n== Done ==")
@@ -1,8 +1,41 @@
-﻿from playwright.sync_api import sync_playwright
-with sync_playwright() as p:
-    browser = p.chromium.launch()
-    page = browser.new_page(viewport={'width':1400,'height':900})
-    page.goto('$releaseUrl', timeout=60000)
-    page.wait_for_timeout(2000)
-    page.screenshot(path=r'${releaseScreenshot}', full_page=True)
-    browser.close()
+﻿import asyncio
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+# Pages rendered at once in the shared browser context
+MAX_CONCURRENT = 4
+
+
+async def _capture(context, limit, url, out):
+    async with limit:
+        page = await context.new_page()
+        try:
+            await page.goto(url, timeout=60000)
+            # Shoot as soon as the network settles; pages that keep polling
+            # are captured once the wait gives up
+            try:
+                await page.wait_for_load_state('networkidle', timeout=8000)
+            except PlaywrightTimeoutError:
+                pass
+            await page.screenshot(path=out, full_page=True)
+        finally:
+            await page.close()
+
+
+async def _capture_all(urls):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        context = await browser.new_context(viewport={'width':1400,'height':900})
+        limit = asyncio.Semaphore(MAX_CONCURRENT)
+        try:
+            await asyncio.gather(*(_capture(context, limit, url, out) for url, out in urls))
+        finally:
+            await browser.close()
+
+
+def capture(urls):
+    """Screenshot each (url, path) pair concurrently, paying for one Chromium launch."""
+    asyncio.run(_capture_all(urls))
+
+
+capture([('$releaseUrl', r'${releaseScreenshot}')])
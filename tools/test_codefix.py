@@ -3,24 +3,46 @@
 
 import os
 import sys
+import asyncio
 import tempfile
 import shutil
+import threading
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from automation.editor import FileEditor
 
+# One editor and scratch dir for the whole module: FileEditor probes git in a
+# subprocess when constructed
+_editor = None
+_test_dir = None
+_editor_lock = threading.Lock()
+
+
+def _shared_editor():
+    """Return the shared (editor, test_dir), creating them on first use."""
+    global _editor, _test_dir
+    with _editor_lock:
+        if _editor is None:
+            _editor = FileEditor(auto_backup=True)
+            _test_dir = tempfile.mkdtemp(prefix="ai_assistant_test_")
+        return _editor, _test_dir
+
+
+def teardown_module(module=None):
+    """Remove the shared scratch dir (pytest hook, also called by run_all_tests)."""
+    global _editor, _test_dir
+    if _test_dir:
+        shutil.rmtree(_test_dir, ignore_errors=True)
+    _editor = _test_dir = None
+
 
 def test_file_editor_basic():
     """Test basic file operations."""
     print("\n=== Test: File Editor - Basic Operations ===")
     
-    editor = FileEditor(auto_backup=True)
-    
-    # Create temp directory for tests
-    test_dir = os.path.join(tempfile.gettempdir(), "ai_assistant_test")
-    os.makedirs(test_dir, exist_ok=True)
+    editor, test_dir = _shared_editor()
     
     test_file = os.path.join(test_dir, "test_file.py")
     
@@ -71,16 +93,13 @@ def add(a, b):
     except Exception as e:
         print(f"Test failed: {e}")
         return False
-    finally:
-        # Cleanup
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_code_analysis():
     """Test code analysis with diff generation."""
     print("\n=== Test: Code Analysis & Diff ===")
     
-    editor = FileEditor()
+    editor, _ = _shared_editor()
     
     # Simulate buggy code
     buggy_code = '''def calculate_average(numbers):
@@ -181,11 +200,25 @@ def run_all_tests():
     print("AI Desktop Assistant - Code Fix System Tests")
     print("=" * 60)
     
-    results = {}
+    # The three phases are independent, so they run side by side on threads
+    # (their console output may interleave)
+    async def _amain():
+        return await asyncio.gather(
+            asyncio.to_thread(test_file_editor_basic),
+            asyncio.to_thread(test_code_analysis),
+            asyncio.to_thread(test_safety_confirmation),
+        )
+    
+    try:
+        file_editor, code_analysis, safety = asyncio.run(_amain())
+    finally:
+        teardown_module()
     
-    results['file_editor'] = test_file_editor_basic()
-    results['code_analysis'] = test_code_analysis()
-    results['safety'] = test_safety_confirmation()
+    results = {
+        'file_editor': file_editor,
+        'code_analysis': code_analysis,
+        'safety': safety,
+    }
     
     # Summary
     print("\n" + "=" * 60)
@@ -5,10 +5,25 @@ Test fuzzy command parsing with spell-tolerant matching.
 
 import sys
 import os
+import re
+import time
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from functools import lru_cache
 from core.command_parser import parse_command, normalize_text, fuzzy_match
 
+# parse_command is pure, so repeated inputs across the suite are parsed once.
+# The returned dicts are shared between callers and must not be mutated.
+parse_command = lru_cache(maxsize=512)(parse_command)
+
+# Multi-step command patterns, compiled once as a single alternation
+_MULTI_RE = re.compile(
+    r'youtube.+search.+click'
+    r'|search.+(?:and|then).+(?:click|open|play)'
+    r'|(?:seek|jump).+(?:to|at).+\d+.*(?:minute|second)'
+)
+_ACTION_WORDS = frozenset(['search', 'open', 'click', 'play', 'pause', 'seek'])
+
 
 def test_spaced_letters():
     """Test collapsing spaced-out letters."""
@@ -100,6 +115,30 @@ def test_app_recognition():
     return passed, len(test_cases)
 
 
+def test_parse_speed():
+    """Micro-benchmark: 100 uncached parses must stay well under a second."""
+    print("\n=== Test: Parse Speed ===")
+    
+    # Bypass the lru_cache wrapper so every iteration really parses
+    parse = parse_command.__wrapped__
+    text = "Open YouTube, search biology 2024, click third video"
+    iterations = 100
+    limit = 1.0  # seconds; typically ~0.05
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(text)
+    elapsed = time.perf_counter() - start
+    
+    status = "PASS" if elapsed < limit else "FAIL"
+    print(f"  {iterations} parses: {elapsed * 1000:.1f} ms (limit {limit * 1000:.0f} ms)")
+    print(f"  Status: {status}")
+    print()
+    
+    assert elapsed < limit, f"{iterations} parses took {elapsed:.3f}s (limit {limit}s)"
+    return (1 if status == "PASS" else 0), 1
+
+
 def test_multistep_detection():
     """Test detection of multi-step commands."""
     print("\n=== Test: Multi-step Command Detection ===")
@@ -110,18 +149,10 @@ def test_multistep_detection():
     # Create minimal controller just for pattern testing
     class MockController:
         def _is_multistep_command(self, text):
-            import re
-            MULTISTEP_PATTERNS = [
-                r'youtube.+search.+click',
-                r'search.+(?:and|then).+(?:click|open|play)',
-                r'(?:seek|jump).+(?:to|at).+\d+.*(?:minute|second)',
-            ]
             text_lower = text.lower()
-            for pattern in MULTISTEP_PATTERNS:
-                if re.search(pattern, text_lower):
-                    return True
-            action_words = ['search', 'open', 'click', 'play', 'pause', 'seek']
-            count = sum(1 for w in action_words if w in text_lower)
+            if _MULTI_RE.search(text_lower):
+                return True
+            count = sum(1 for w in _ACTION_WORDS if w in text_lower)
             return count >= 2
     
     mock = MockController()
@@ -171,6 +202,10 @@ def main():
     total_passed += p
     total_tests += t
     
+    p, t = test_parse_speed()
+    total_passed += p
+    total_tests += t
+    
     p, t = test_multistep_detection()
     total_passed += p
     total_tests += t
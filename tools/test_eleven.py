@@ -1,61 +1,90 @@
 """test_eleven.py — validate ElevenLabs API key and model availability
-Run: python tools/test_eleven.py
+Run: python tools/test_eleven.py          (live key check)
+     pytest tools/test_eleven.py --run-network [--full-tts] [--record-network]
+
+Marked `network`: skipped unless --run-network is given. The key is checked
+against the cheap /v1/user endpoint; real synthesis only runs with --full-tts.
+Successful TTS responses are remembered in the pytest cache per (voice, model,
+text), so re-runs don't spend API quota; --record-network also saves the audio
+to disk.
 """
 
+import hashlib
 import os
-from dotenv import load_dotenv
-load_dotenv()
-
-key = os.getenv("ELEVENLABS_API_KEY")
-if not key or "REPLACE" in key:
-    print("ELEVENLABS_API_KEY not set or still placeholder in .env")
-    exit(1)
+import sys
 
+import pytest
 import requests
-# Use a voice ID in the URL and request a model in the payload. Update voice_id if needed.
-voice_id = os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
-model = os.getenv("ELEVENLABS_MODEL_ID", "eleven_multilingual_v2")
-url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-headers = {"xi-api-key": key, "Content-Type": "application/json"}
-payload = {"text": "Hello, this is a test from your assistant.", "model": model}
-
-print(f"Testing ElevenLabs with key prefix: {key[:8]}, voice: {voice_id}, model: {model}...")
-r = requests.post(url, json=payload, headers=headers, timeout=15)
-print(f"Status: {r.status_code}")
-
-if r.status_code == 200:
-    print(f"ElevenLabs TTS OK — received {len(r.content)} bytes audio.")
-    with open("test_tts.bin", "wb") as f:
-        f.write(r.content)
-    print("Saved to test_tts.bin")
-else:
-    print(f"ElevenLabs error response:\n{r.text[:1000]}")
-# test_eleven.py — validate ElevenLabs API key
-# Run: python tools/test_eleven.py
 
-import os
-from dotenv import load_dotenv
-load_dotenv()
+pytestmark = pytest.mark.network
 
-key = os.getenv("ELEVENLABS_API_KEY")
-if not key or "REPLACE" in key:
-    print("ELEVENLABS_API_KEY not set or still placeholder in .env")
-    exit(1)
+VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
+MODEL = os.getenv("ELEVENLABS_MODEL_ID", "eleven_multilingual_v2")
+TEXT = "Hello, this is a test from your assistant."
+
+
+@pytest.fixture(scope="module")
+def session():
+    """One keep-alive session for every probe in this file: later requests skip
+    the TCP/TLS handshake."""
+    key = os.getenv("ELEVENLABS_API_KEY")
+    if not key or "REPLACE" in key:
+        pytest.skip("ELEVENLABS_API_KEY not set or still placeholder in .env")
+    s = requests.Session()
+    s.headers.update({"xi-api-key": key, "Content-Type": "application/json"})
+    print(f"Testing ElevenLabs with key prefix: {key[:8]}")
+    yield s
+    s.close()
 
-import requests
-url = "https://api.elevenlabs.io/v1/text-to-speech/21m00Tcm4TlvDq8ikWAM"
-headers = {"xi-api-key": key, "Content-Type": "application/json"}
-payload = {"text": "Hello, this is a test from your assistant.", "model_id": "eleven_multilingual_v1"}
 
-print(f"Testing ElevenLabs with key: {key[:8]}...")
-r = requests.post(url, json=payload, headers=headers, timeout=15)
-print(f"Status: {r.status_code}")
+def test_eleven_key(session):
+    """Key is accepted (auth-only endpoint, no synthesis)."""
+    r = session.get("https://api.elevenlabs.io/v1/user", timeout=5)
+    print(f"Status: {r.status_code}")
+    assert r.status_code == 200, f"ElevenLabs error response:\n{r.text[:1000]}"
+    print("ElevenLabs key OK")
+
+
+# (model, file the audio is saved to under --record-network)
+PROBES = [
+    (MODEL, "test_tts.bin"),
+    ("eleven_multilingual_v1", "test_tts.mp3"),
+]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("model,out", PROBES, ids=[m for m, _ in PROBES])
+def test_eleven_tts(request, session, model, out):
+    """POST a TTS request unless an earlier run already got a 200 for it."""
+    if not request.config.getoption("--full-tts"):
+        pytest.skip("full synthesis needs --full-tts")
+    cache = getattr(request.config, "cache", None)  # absent under -p no:cacheprovider
+    text_hash = hashlib.sha1(TEXT.encode("utf-8")).hexdigest()[:12]
+    cache_key = f"eleven/{VOICE_ID}/{model}/{text_hash}"
+    if cache is not None:
+        hit = cache.get(cache_key, None)
+        if hit:
+            print(f"ElevenLabs TTS OK (cached) — {hit['bytes']} bytes audio, sha256 {hit['sha256'][:12]}")
+            return
+
+    print(f"Testing ElevenLabs voice: {VOICE_ID}, model: {model}...")
+    r = session.post(f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}",
+                     json={"text": TEXT, "model_id": model}, timeout=15)
+    print(f"Status: {r.status_code}")
+    assert r.status_code == 200, f"ElevenLabs error response:\n{r.text[:1000]}"
 
-if r.status_code == 200:
     print(f"ElevenLabs TTS OK — received {len(r.content)} bytes audio.")
-    # Optionally save and play
-    with open("test_tts.mp3", "wb") as f:
-        f.write(r.content)
-    print("Saved to test_tts.mp3")
-else:
-    print(f"ElevenLabs error response:\n{r.text[:500]}")
+    if cache is not None:
+        cache.set(cache_key, {
+            "status": r.status_code,
+            "bytes": len(r.content),
+            "sha256": hashlib.sha256(r.content[:4096]).hexdigest(),
+        })
+    if request.config.getoption("--record-network"):
+        with open(out, "wb") as f:
+            f.write(r.content)
+        print(f"Saved to {out}")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s", "--run-network", *sys.argv[1:]]))
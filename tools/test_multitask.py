@@ -5,99 +5,84 @@ Tests core system integration.
 """
 
 import sys
-from pathlib import Path
+import importlib
+import importlib.util
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 
+# (module, class it must define) for the slow full import check
+MODULES = [
+    ("core.main_controller", "MainController"),
+    ("core.watchdog", "Watchdog"),
+    ("core.repair_engine", "RepairEngine"),
+    ("core.self_heal_planner", "SelfHealPlanner"),
+    ("core.approval", "ApprovalManager"),
+    ("core.self_update", "SelfUpdater"),
+    ("speech.local_tts", "LocalTTS"),
+]
+
+
+# The *_import tests are existence checks only: find_spec does not execute the
+# module, so heavy dependencies (whisper, TTS engines, ...) are not loaded.
+# test_full_import_chain does the real imports.
+
 def test_main_controller_import():
-    """Test main controller can be imported."""
-    from core.main_controller import MainController
-    assert MainController is not None
-    print(" MainController import OK")
+    """Test main controller can be found."""
+    assert importlib.util.find_spec("core.main_controller") is not None
+    print(" core.main_controller found")
 
 
 def test_watchdog_import():
-    """Test watchdog can be imported."""
-    from core.watchdog import Watchdog, get_watchdog
-    assert Watchdog is not None
-    print(" Watchdog import OK")
+    """Test watchdog can be found."""
+    assert importlib.util.find_spec("core.watchdog") is not None
+    print(" core.watchdog found")
 
 
 def test_repair_engine_import():
-    """Test repair engine can be imported."""
-    from core.repair_engine import RepairEngine, get_repair_engine
-    assert RepairEngine is not None
-    print(" RepairEngine import OK")
+    """Test repair engine can be found."""
+    assert importlib.util.find_spec("core.repair_engine") is not None
+    print(" core.repair_engine found")
 
 
 def test_self_heal_planner_import():
-    """Test self-heal planner can be imported."""
-    from core.self_heal_planner import SelfHealPlanner
-    assert SelfHealPlanner is not None
-    print(" SelfHealPlanner import OK")
+    """Test self-heal planner can be found."""
+    assert importlib.util.find_spec("core.self_heal_planner") is not None
+    print(" core.self_heal_planner found")
 
 
 def test_approval_manager_import():
-    """Test approval manager can be imported."""
-    from core.approval import ApprovalManager
-    assert ApprovalManager is not None
-    print(" ApprovalManager import OK")
+    """Test approval manager can be found."""
+    assert importlib.util.find_spec("core.approval") is not None
+    print(" core.approval found")
 
 
 def test_self_updater_import():
-    """Test self updater can be imported."""
-    from core.self_update import SelfUpdater, get_updater
-    assert SelfUpdater is not None
-    print(" SelfUpdater import OK")
+    """Test self updater can be found."""
+    assert importlib.util.find_spec("core.self_update") is not None
+    print(" core.self_update found")
 
 
 def test_tts_import():
-    """Test TTS can be imported."""
-    from speech.local_tts import LocalTTS
-    assert LocalTTS is not None
-    print(" LocalTTS import OK")
-
-
-def test_env_loaded():
-    """Test environment variables loaded."""
-    import os
-    from dotenv import load_dotenv
-    load_dotenv()
-    
-    assert os.getenv("SELF_HEAL_ENABLED") is not None
+    """Test TTS can be found."""
+    assert importlib.util.find_spec("speech.local_tts") is not None
+    print(" speech.local_tts found")
+
+
+@pytest.mark.slow
+def test_full_import_chain():
+    """Test every module really imports and defines its main class."""
+    for module, cls in MODULES:
+        mod = importlib.import_module(module)
+        assert getattr(mod, cls) is not None
+        print(f" {cls} import OK")
+
+
+def test_env_loaded(env):
+    """Test environment variables loaded (conftest.py loads .env once per session)."""
+    assert env.get("SELF_HEAL_ENABLED") is not None
     print(" Environment loaded")
 
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("MULTITASK SMOKE TESTS")
-    print("=" * 50)
-    
-    tests = [
-        test_main_controller_import,
-        test_watchdog_import,
-        test_repair_engine_import,
-        test_self_heal_planner_import,
-        test_approval_manager_import,
-        test_self_updater_import,
-        test_tts_import,
-        test_env_loaded,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f" {test.__name__}: {e}")
-            failed += 1
-    
-    print("=" * 50)
-    print(f"Results: {passed} passed, {failed} failed")
-    print("=" * 50)
-    
-    exit(0 if failed == 0 else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
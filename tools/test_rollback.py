@@ -7,7 +7,7 @@ import sys
 import os
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 
 def test_backup_creation():
@@ -15,13 +15,46 @@ def test_backup_creation():
     from core.self_update import get_updater
     
     updater = get_updater()
-    backup_path = updater.create_backup()
+    # Stored, not deflated: the test checks the backup exists, not its size
+    backup_path = updater.create_backup(fast=True)
     
     assert backup_path is not None
     assert Path(backup_path).exists()
     print(f" Backup created: {Path(backup_path).name}")
 
 
+def test_zstd_backup_round_trip(tmp_path, monkeypatch):
+    """Test a .tar.zst backup restores a modified tree."""
+    pytest.importorskip("zstandard")
+    import core.self_update as self_update
+    
+    repo = tmp_path / "repo"
+    (repo / "sub").mkdir(parents=True)
+    original = {
+        "a.txt": b"hello\n",
+        "sub/b.bin": bytes(range(256)) * 64,
+    }
+    for rel, data in original.items():
+        (repo / rel).write_bytes(data)
+    
+    monkeypatch.setattr(self_update, "SNAPSHOTS_DIR", tmp_path / "backups")
+    monkeypatch.setattr(self_update, "SELF_UPDATE_AUTO_BACKUP", False)
+    updater = self_update.SelfUpdater()
+    updater._repo_root = repo
+    updater._notify = lambda *args, **kwargs: None
+    
+    backup_path = updater.create_backup()
+    assert backup_path.endswith(".tar.zst")
+    
+    (repo / "a.txt").write_bytes(b"changed\n")
+    (repo / "sub" / "b.bin").unlink()
+    
+    assert updater.rollback(backup_path)
+    for rel, data in original.items():
+        assert (repo / rel).read_bytes() == data, rel
+    print(f" Round trip OK: {Path(backup_path).name}")
+
+
 def test_snapshot_prune():
     """Test snapshot pruning works."""
     from core.self_update import prune_old_snapshots
@@ -48,30 +81,5 @@ def test_keep_snapshots_config():
 
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("ROLLBACK TESTS")
-    print("=" * 50)
-    
-    tests = [
-        test_backup_creation,
-        test_snapshot_prune,
-        test_rollback_config,
-        test_keep_snapshots_config,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f" {test.__name__}: {e}")
-            failed += 1
-    
-    print("=" * 50)
-    print(f"Results: {passed} passed, {failed} failed")
-    print("=" * 50)
-    
-    exit(0 if failed == 0 else 1)
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
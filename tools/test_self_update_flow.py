@@ -4,9 +4,6 @@ Test self-update flow for Full Autonomy validation.
 """
 
 import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
 def test_updater_initialization():
@@ -46,10 +43,9 @@ def test_maintenance_window():
 
 
 def test_snapshot_dir_exists():
-    """Test snapshots directory can be created."""
+    """Test snapshots directory exists (created once per session by conftest.py)."""
     from core.watchdog import SNAPSHOTS_DIR
     
-    SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
     assert SNAPSHOTS_DIR.exists()
     print(f" Snapshots dir OK: {SNAPSHOTS_DIR}")
 
@@ -65,31 +61,5 @@ def test_log_functions():
 
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("SELF-UPDATE FLOW TESTS")
-    print("=" * 50)
-    
-    tests = [
-        test_updater_initialization,
-        test_status_structure,
-        test_maintenance_window,
-        test_snapshot_dir_exists,
-        test_log_functions,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f" {test.__name__}: {e}")
-            failed += 1
-    
-    print("=" * 50)
-    print(f"Results: {passed} passed, {failed} failed")
-    print("=" * 50)
-    
-    exit(0 if failed == 0 else 1)
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
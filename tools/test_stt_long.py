@@ -5,9 +5,22 @@ Tests ASR initialization and basic functionality.
 """
 
 import sys
-from pathlib import Path
+import types
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+
+
+@pytest.fixture
+def fast_asr(monkeypatch):
+    """speech.asr with a stub WhisperModel and a fresh singleton, so no weights load."""
+    import speech.asr as asr
+    stub = lambda *a, **k: types.SimpleNamespace(transcribe=lambda *a, **k: ([], {}))
+    monkeypatch.setattr(asr, "WhisperModel", stub)
+    monkeypatch.setattr(asr, "WHISPER_AVAILABLE", True)
+    monkeypatch.setattr(asr, "_engine", None)
+    # Skip the CUDA probe: run against the stub, it would cache a result for later tests
+    monkeypatch.setattr(asr, "_cuda_available", False)
+    return asr
 
 
 def test_asr_import():
@@ -17,24 +30,30 @@ def test_asr_import():
     print(" ASR import OK")
 
 
-def test_asr_initialization():
+def test_asr_initialization(fast_asr):
     """Test ASR engine initializes."""
-    from speech.asr import get_engine
-    
-    engine = get_engine()
+    engine = fast_asr.get_engine()
     assert engine is not None
     print(" ASR engine initialized")
 
 
-def test_asr_has_model():
+def test_asr_has_model(fast_asr):
     """Test ASR has a model loaded."""
-    from speech.asr import get_engine
-    
-    engine = get_engine()
+    engine = fast_asr.get_engine()
     assert hasattr(engine, '_model') or hasattr(engine, 'model')
     print(" ASR model present")
 
 
+@pytest.mark.slow
+def test_asr_real_model():
+    """Test the real tiny Whisper model loads."""
+    from speech.asr import ASREngine
+    
+    engine = ASREngine(model_name="tiny")
+    assert engine.model is not None
+    print(f" ASR model loaded: {engine.model_name} on {engine.device}")
+
+
 def test_asr_device():
     """Test ASR device configuration."""
     import os
@@ -44,30 +63,4 @@ def test_asr_device():
 
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("STT LONG SMOKE TESTS")
-    print("=" * 50)
-    
-    tests = [
-        test_asr_import,
-        test_asr_initialization,
-        test_asr_has_model,
-        test_asr_device,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f" {test.__name__}: {e}")
-            failed += 1
-    
-    print("=" * 50)
-    print(f"Results: {passed} passed, {failed} failed")
-    print("=" * 50)
-    
-    exit(0 if failed == 0 else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
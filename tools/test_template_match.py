@@ -0,0 +1,120 @@
+﻿# tools/test_template_match.py
+"""
+Coarse-to-fine template matching must agree with a plain full-res match, and
+a miss must not fall back to one unless asked to.
+"""
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+
+def _screen(seed, h=1080, w=1920):
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur((rng.random((h, w)) * 255).astype(np.uint8), (7, 7), 0)
+
+
+def _full_res(screen, template):
+    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_val, max_loc
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_pyramid_matches_full_res_with_two_instances(seed):
+    """An exact copy and a noisier copy on screen: the pyramid must pick the
+    same location (and score) as matching the whole screen at full size."""
+    from vision.template_match import _match_best
+    
+    screen = _screen(seed)
+    rng = np.random.default_rng(seed + 100)
+    template = screen[300:380, 500:700].copy()
+    
+    # Second instance: the template again, degraded, elsewhere on screen
+    noisy = np.clip(template.astype(np.int16) + rng.integers(-40, 41, template.shape), 0, 255)
+    screen[700:780, 1500:1700] = noisy.astype(np.uint8)
+    
+    expected_val, expected_loc = _full_res(screen, template)
+    val, loc = _match_best(screen, template, threshold=0.8)
+    
+    assert loc == expected_loc
+    assert val == pytest.approx(expected_val, abs=1e-4)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_pyramid_finds_match_among_coarse_decoys(seed):
+    """Decoys share the template's smooth content and differ only in a
+    pixel-level checkerboard that pyrDown erases, so at 1/4 scale they beat the
+    real (grid-misaligned) copy; only the real one scores 1.0 at full size.
+    The pyramid alone may miss it but must not report a decoy; with the
+    full-res fallback the result equals the full-res match."""
+    from vision.template_match import _match_best
+    
+    rng = np.random.default_rng(seed)
+    screen = _screen(seed)
+    low = cv2.GaussianBlur((rng.random((80, 200)) * 255).astype(np.float32), (31, 31), 0)
+    low = (low - low.mean()) * 4 + 128
+    checker = np.indices(low.shape).sum(axis=0) % 2 * 2 - 1
+    
+    def patch():
+        fine = cv2.GaussianBlur(rng.random(low.shape).astype(np.float32) * 2 - 1, (15, 15), 0)
+        fine /= np.abs(fine).max()
+        return np.clip(low + 60 * checker * fine, 0, 255).astype(np.uint8)
+    
+    spots = [(y, x) for y in (48, 300, 552, 800) for x in (100, 600, 1100, 1600)]
+    order = rng.permutation(len(spots))
+    for i in order[1:]:
+        y, x = spots[i]
+        screen[y:y + 80, x:x + 200] = patch()
+    y, x = spots[order[0]]
+    y, x = y + 2, x + 2  # Off the 4px pyramid grid: weaker at the coarse level
+    template = patch()
+    screen[y:y + 80, x:x + 200] = template
+    
+    expected_val, expected_loc = _full_res(screen, template)
+    assert expected_loc == (x, y)
+    val, loc = _match_best(screen, template, threshold=0.8)
+    assert val < 0.8 or loc == expected_loc
+    
+    val, loc = _match_best(screen, template, threshold=0.8, full_res_fallback=True)
+    assert loc == expected_loc
+    assert val == pytest.approx(expected_val, abs=1e-4)
+
+
+def test_pyramid_edge_match():
+    """Odd-sized template in the bottom-right corner (blurred badly by pyrDown):
+    found through the full-res fallback."""
+    from vision.template_match import _match_best
+    
+    screen = _screen(7)
+    template = screen[-77:, -201:].copy()
+    
+    result = _match_best(screen, template, threshold=0.8, full_res_fallback=True)
+    assert result[1] == _full_res(screen, template)[1]
+
+
+def test_pyramid_miss_skips_full_res(monkeypatch):
+    """A template that is not on screen costs the coarse pass only."""
+    from vision.template_match import _match_best
+    
+    screen = _screen(0)
+    template = _screen(1)[300:380, 500:700].copy()
+    
+    shapes = []
+    match_template = cv2.matchTemplate
+    
+    def counting(image, templ, method):
+        shapes.append(image.shape)
+        return match_template(image, templ, method)
+    
+    monkeypatch.setattr(cv2, "matchTemplate", counting)
+    val, _ = _match_best(screen, template, threshold=0.8)
+    
+    assert val < 0.8
+    assert screen.shape not in shapes
+    
+    shapes.clear()
+    _match_best(screen, template, threshold=0.8, full_res_fallback=True)
+    assert screen.shape in shapes
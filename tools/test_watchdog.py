@@ -5,25 +5,29 @@ Tests for the Watchdog health monitoring system.
 
 import sys
 import os
+import time
 from pathlib import Path
 
 # Add project root
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.watchdog import (
+    get_watchdog,
+    Watchdog,
+    HealthStatus,
+    ComponentHealth,
+    DiagnosticReport,
+)
+
 def test_watchdog_initialization():
     """Test watchdog initializes correctly."""
-    from core.watchdog import get_watchdog, Watchdog
-    
     wd = get_watchdog()
     assert isinstance(wd, Watchdog)
     print(" Watchdog initialization OK")
 
-def test_diagnostics_without_components():
+def test_diagnostics_without_components(watchdog):
     """Test diagnostics runs even without components registered."""
-    from core.watchdog import get_watchdog
-    
-    wd = get_watchdog()
-    report = wd.run_diagnostics()
+    report = watchdog.run_diagnostics()
     
     assert report is not None
     assert report.timestamp > 0
@@ -32,8 +36,6 @@ def test_diagnostics_without_components():
 
 def test_health_status_enum():
     """Test health status enum values."""
-    from core.watchdog import HealthStatus
-    
     assert HealthStatus.HEALTHY.value == "healthy"
     assert HealthStatus.DEGRADED.value == "degraded"
     assert HealthStatus.FAILED.value == "failed"
@@ -41,9 +43,6 @@ def test_health_status_enum():
 
 def test_component_health_dataclass():
     """Test component health dataclass."""
-    from core.watchdog import ComponentHealth, HealthStatus
-    import time
-    
     ch = ComponentHealth(
         name="test",
         status=HealthStatus.HEALTHY,
@@ -57,9 +56,6 @@ def test_component_health_dataclass():
 
 def test_diagnostic_report_dataclass():
     """Test diagnostic report dataclass."""
-    from core.watchdog import DiagnosticReport, HealthStatus
-    import time
-    
     report = DiagnosticReport(
         timestamp=time.time(),
         components={},
@@ -72,23 +68,17 @@ def test_diagnostic_report_dataclass():
     assert len(report.issues) == 0
     print(" DiagnosticReport dataclass OK")
 
-def test_status_text():
+def test_status_text(watchdog):
     """Test human-readable status generation."""
-    from core.watchdog import get_watchdog
-    
-    wd = get_watchdog()
-    text = wd.get_status_text()
+    text = watchdog.get_status_text()
     
     assert isinstance(text, str)
     assert len(text) > 0
     print(f" Status text: '{text[:50]}...'")
 
-def test_get_status():
+def test_get_status(watchdog):
     """Test status dict generation."""
-    from core.watchdog import get_watchdog
-    
-    wd = get_watchdog()
-    status = wd.get_status()
+    status = watchdog.get_status()
     
     assert "overall" in status
     assert "issues" in status
@@ -97,33 +87,5 @@ def test_get_status():
 
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("WATCHDOG TESTS")
-    print("=" * 50)
-    
-    tests = [
-        test_watchdog_initialization,
-        test_diagnostics_without_components,
-        test_health_status_enum,
-        test_component_health_dataclass,
-        test_diagnostic_report_dataclass,
-        test_status_text,
-        test_get_status,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f" {test.__name__}: {e}")
-            failed += 1
-    
-    print("=" * 50)
-    print(f"Results: {passed} passed, {failed} failed")
-    print("=" * 50)
-    
-    exit(0 if failed == 0 else 1)
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -16,19 +16,42 @@ SNAPSHOTS_DIR = Path(__file__).parent.parent / "logs" / "snapshots"
 UPLOAD_URL = os.getenv("SELF_UPDATE_UPLOAD_URL", "")
 UPLOAD_TOKEN = os.getenv("SELF_UPDATE_UPLOAD_TOKEN", "")
 
+# Archive formats written by core.self_update.create_backup
+SNAPSHOT_SUFFIXES = (".tar.zst", ".zip")
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Keep-alive session shared by every upload attempt in this process
+_session = None
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
 
 def get_latest_snapshot() -> Path:
-    """Find the most recent snapshot zip."""
+    """Find the most recent snapshot archive (.tar.zst or .zip)."""
     if not SNAPSHOTS_DIR.exists():
         return None
     
-    zips = sorted(
-        [p for p in SNAPSHOTS_DIR.iterdir() if p.suffix == ".zip"],
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )
+    # One scandir pass keeping the newest archive; DirEntry.stat() reuses the
+    # data scandir already fetched where the platform provides it
+    best, best_mtime = None, -1
+    with os.scandir(SNAPSHOTS_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(SNAPSHOT_SUFFIXES) and entry.is_file():
+                mtime = entry.stat().st_mtime
+                if mtime > best_mtime:
+                    best, best_mtime = entry.path, mtime
     
-    return zips[0] if zips else None
+    return Path(best) if best else None
 
 
 def upload_snapshot(path: Path) -> bool:
@@ -38,7 +61,7 @@ def upload_snapshot(path: Path) -> bool:
         return False
     
     try:
-        import requests
+        session = _get_session()
         
         headers = {}
         if UPLOAD_TOKEN:
@@ -46,9 +69,17 @@ def upload_snapshot(path: Path) -> bool:
         
         print(f"Uploading {path.name} to {UPLOAD_URL}...")
         
+        content_type = "application/zstd" if path.name.endswith(".tar.zst") else "application/zip"
         with open(path, "rb") as f:
-            files = {"file": (path.name, f, "application/zip")}
-            resp = requests.post(UPLOAD_URL, files=files, headers=headers, timeout=300)
+            if MultipartEncoder is not None:
+                # Stream the multipart body from disk in chunks instead of
+                # building the whole encoded request in memory
+                encoder = MultipartEncoder(fields={"file": (path.name, f, content_type)})
+                headers["Content-Type"] = encoder.content_type
+                resp = session.post(UPLOAD_URL, data=encoder, headers=headers, timeout=300)
+            else:
+                files = {"file": (path.name, f, content_type)}
+                resp = session.post(UPLOAD_URL, files=files, headers=headers, timeout=300)
         
         if resp.status_code in (200, 201):
             print(f" Upload successful: {resp.status_code}")
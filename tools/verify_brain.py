@@ -1,5 +1,9 @@
-﻿import os
+﻿import functools
+import importlib
+import json
+import os
 import sys
+import time
 from pathlib import Path
 
 # Add project root to path
@@ -7,35 +11,70 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 os.chdir(PROJECT_ROOT)
 
+# Brain modules and the names each must provide
+BRAIN_MODULES = {
+    'core.llm_brain': ('llm_generate', 'get_brain_status'),
+    'core.model_selector': ('select_model',),
+    'core.autonomous_coder': ('analyze_and_fix',),
+    'core.task_planner': ('create_plan', 'quick_command'),
+    'core.autonomous_review': ('generate_daily_digest',),
+}
+
+# ollama.list() result shared by runs less than a minute apart
+OLLAMA_CACHE = Path.home() / '.cache' / 'ai-desktop' / 'ollama.json'
+OLLAMA_CACHE_TTL = 60  # seconds
+
+@functools.lru_cache(maxsize=1)
+def _env():
+    """Load .env once per process, however many checks ask for it."""
+    from dotenv import load_dotenv
+    load_dotenv(PROJECT_ROOT / '.env')
+    return True
+
+def _ollama_models():
+    """Model names from the local Ollama daemon, reused from disk for OLLAMA_CACHE_TTL seconds."""
+    try:
+        if time.time() - OLLAMA_CACHE.stat().st_mtime < OLLAMA_CACHE_TTL:
+            return json.loads(OLLAMA_CACHE.read_text())['models']
+    except (OSError, ValueError, KeyError):
+        pass
+    import ollama
+    models = [m.get('model') or m.get('name') for m in ollama.list().get('models', [])]
+    OLLAMA_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    OLLAMA_CACHE.write_text(json.dumps({'models': models}))
+    return models
+
 def verify_autonomous_brain():
     errors = []
     checks = []
     
     # 1. Check AUTONOMOUS_CODING_ENABLED in env
-    from dotenv import load_dotenv
-    load_dotenv(PROJECT_ROOT / '.env')
+    _env()
     if os.getenv('AUTONOMOUS_CODING_ENABLED', '').lower() == 'true':
         checks.append('AUTONOMOUS_CODING_ENABLED=true')
     else:
         errors.append('AUTONOMOUS_CODING_ENABLED not set')
     
-    # 2. Check modules import
-    try:
-        from core.llm_brain import llm_generate, get_brain_status
-        from core.model_selector import select_model
-        from core.autonomous_coder import analyze_and_fix
-        from core.task_planner import create_plan, quick_command
-        from core.autonomous_review import generate_daily_digest
-        checks.append('All modules import successfully')
-    except Exception as e:
-        errors.append(f'Module import failed: {e}')
-        get_brain_status = None
+    # 2. Check modules import, one at a time so a failure names its module
+    # and stops before paying for the imports after it
+    get_brain_status = None
+    for name, attrs in BRAIN_MODULES.items():
+        t0 = time.perf_counter()
+        try:
+            module = importlib.import_module(name)
+            missing = [a for a in attrs if not hasattr(module, a)]
+            if missing:
+                raise ImportError(f"missing {', '.join(missing)}")
+        except Exception as e:
+            errors.append(f'Module import failed: {name}: {e}')
+            break
+        checks.append(f'{name} imported ({(time.perf_counter() - t0) * 1000:.1f}ms)')
+        if name == 'core.llm_brain':
+            get_brain_status = module.get_brain_status
     
     # 3. Check Ollama connection
     try:
-        import ollama
-        models = ollama.list()
-        model_list = models.get('models', [])
+        model_list = _ollama_models()
         checks.append(f'Ollama connected: {len(model_list)} models')
     except Exception as e:
         errors.append(f'Ollama connection failed: {e}')
@@ -6,6 +6,7 @@ Toggle with Ctrl+Alt+U
 """
 
 import os
+import queue
 import sys
 import threading
 import time
@@ -19,11 +20,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 class HUDOverlay:
     """Lightweight always-on-top HUD overlay."""
     
+    # Fields accepted by update(); 'message' is shown as the status line
+    UPDATE_FIELDS = frozenset({'listening', 'status', 'step', 'error', 'message'})
+    
     def __init__(self):
         self.root = None
         self.visible = False
         self._thread = None
         self._running = False
+        self._ready = threading.Event()  # Set once the window is built
+        self._closing = False  # destroy() called; stop waking the Tk thread
         
         # State
         self.listening = False
@@ -33,15 +39,35 @@ class HUDOverlay:
         self.error_msg = ""
         self.status_text = "Ready"
         
+        # Setters (and show/hide/destroy) may run on any thread: they only queue
+        # (field, value) and post <<HUDUpdate>>. The Tk thread drains the queue,
+        # applies real changes to the state above, and reconfigures just the
+        # dirty widgets, so only the thread that owns the interpreter touches Tk.
+        # With no window, setters apply to the state directly (nothing queues up).
+        # The lock orders those direct writes against root being set or cleared.
+        self._q = queue.SimpleQueue()
+        self._state_lock = threading.Lock()
+        self._dirty = {'status': True, 'step': True, 'error': True, 'indicator': True}
+        self._last = {'listening': False, 'status': "Ready", 'step': (0, 0, ""), 'error': ""}
+        
         # UI elements
-        self._status_label = None
-        self._step_label = None
-        self._error_label = None
-        self._listening_indicator = None
+        self._canvas = None
+        self._status_item = None
+        self._step_item = None
+        self._error_item = None
+        self._indicator_item = None
+        self._indicator_active = False
+        # Text currently shown by each item; itemconfigure() only when it changes
+        self._last_status = self._last_step = self._last_error = None
+        # Inputs the step/error strings were last built from; rebuilt only on change
+        self._step_key = self._err_key = None
+        self._step_text = self._error_text = ""
     
     def _create_window(self):
         """Create the HUD window."""
-        self.root = tk.Tk()
+        root = tk.Tk()
+        with self._state_lock:
+            self.root = root  # Setters queue from here on
         self.root.title("AI Assistant")
         self.root.attributes('-topmost', True)
         self.root.attributes('-alpha', 0.85)
@@ -54,56 +80,49 @@ class HUDOverlay:
         # Dark theme
         self.root.configure(bg='#1e1e1e')
         
-        # Main frame
-        frame = tk.Frame(self.root, bg='#1e1e1e', padx=10, pady=8)
-        frame.pack(fill='both', expand=True)
-        
-        # Header with listening indicator
-        header = tk.Frame(frame, bg='#1e1e1e')
-        header.pack(fill='x')
+        # Everything is drawn on one canvas: text items are reconfigured in
+        # place, so a text change never goes through the packer
+        self._canvas = tk.Canvas(self.root, width=280, height=100, bg='#1e1e1e', highlightthickness=0)
+        self._canvas.pack(fill='both', expand=True)
         
-        self._listening_indicator = tk.Canvas(header, width=12, height=12, bg='#1e1e1e', highlightthickness=0)
-        self._listening_indicator.pack(side='left', padx=(0, 8))
-        self._draw_indicator(False)
+        # Header with listening indicator (one persistent oval, recolored on
+        # listening transitions only)
+        self._indicator_item = self._canvas.create_oval(12, 14, 20, 22, fill='#555555', outline='#555555')
+        self._indicator_active = False
         
-        self._status_label = tk.Label(
-            header, text="Ready", 
-            fg='#ffffff', bg='#1e1e1e',
-            font=('Segoe UI', 10, 'bold')
+        self._status_item = self._canvas.create_text(
+            30, 18, text="Ready", anchor='w',
+            fill='#ffffff', font=('Segoe UI', 10, 'bold')
         )
-        self._status_label.pack(side='left')
         
         # Step progress
-        self._step_label = tk.Label(
-            frame, text="", 
-            fg='#888888', bg='#1e1e1e',
-            font=('Segoe UI', 9),
-            anchor='w'
+        self._step_item = self._canvas.create_text(
+            10, 33, text="", anchor='nw',
+            fill='#888888', font=('Segoe UI', 9)
         )
-        self._step_label.pack(fill='x', pady=(5, 0))
         
         # Error message
-        self._error_label = tk.Label(
-            frame, text="",
-            fg='#ff6b6b', bg='#1e1e1e',
-            font=('Segoe UI', 9),
-            anchor='w',
-            wraplength=260
+        self._error_item = self._canvas.create_text(
+            10, 52, text="", anchor='nw',
+            fill='#ff6b6b', font=('Segoe UI', 9),
+            width=260
         )
-        self._error_label.pack(fill='x', pady=(3, 0))
         
         # Make window draggable
         self.root.bind('<Button-1>', self._start_drag)
         self.root.bind('<B1-Motion>', self._do_drag)
         
-        # Start update loop
-        self._update_ui()
+        # Redraw on demand, then once now for any state set before the window existed
+        self.root.bind('<<HUDUpdate>>', lambda e: self._on_hud_update())
+        self._on_hud_update()
     
     def _draw_indicator(self, active: bool):
-        """Draw the listening indicator circle."""
-        self._listening_indicator.delete('all')
+        """Color the listening indicator circle."""
+        if active == self._indicator_active:
+            return
         color = '#4caf50' if active else '#555555'
-        self._listening_indicator.create_oval(2, 2, 10, 10, fill=color, outline=color)
+        self._canvas.itemconfigure(self._indicator_item, fill=color, outline=color)
+        self._indicator_active = active
     
     def _start_drag(self, event):
         self._drag_x = event.x
@@ -114,63 +133,143 @@ class HUDOverlay:
         y = self.root.winfo_y() + event.y - self._drag_y
         self.root.geometry(f"+{x}+{y}")
     
-    def _update_ui(self):
-        """Update UI elements from state."""
+    def _render_dirty(self):
+        """Update the canvas items whose state changed since the last render."""
         if not self.root:
             return
         
+        dirty = self._dirty
         try:
             # Update listening indicator
-            self._draw_indicator(self.listening)
+            if dirty['indicator']:
+                self._draw_indicator(self.listening)
             
             # Update status
-            status = "🎤 Listening..." if self.listening else self.status_text
-            self._status_label.config(text=status)
+            if dirty['status']:
+                status = "🎤 Listening..." if self.listening else self.status_text
+                if status != self._last_status:
+                    self._canvas.itemconfigure(self._status_item, text=status)
+                    self._last_status = status
             
             # Update step progress
-            if self.total_steps > 0:
-                self._step_label.config(text=f"Step {self.step_num}/{self.total_steps}: {self.current_step}")
-            else:
-                self._step_label.config(text="")
+            if dirty['step']:
+                key = (self.step_num, self.total_steps, self.current_step)
+                if key != self._step_key:
+                    self._step_key = key
+                    self._step_text = f"Step {key[0]}/{key[1]}: {key[2]}" if key[1] > 0 else ""
+                step = self._step_text
+                if step != self._last_step:
+                    self._canvas.itemconfigure(self._step_item, text=step)
+                    self._last_step = step
             
             # Update error
-            if self.error_msg:
-                self._error_label.config(text=f"⚠ {self.error_msg}")
-            else:
-                self._error_label.config(text="")
-            
-            # Schedule next update
-            self.root.after(100, self._update_ui)
+            if dirty['error']:
+                if self.error_msg != self._err_key:
+                    self._err_key = self.error_msg
+                    self._error_text = f"⚠ {self.error_msg}" if self.error_msg else ""
+                error = self._error_text
+                if error != self._last_error:
+                    self._canvas.itemconfigure(self._error_item, text=error)
+                    self._last_error = error
         except tk.TclError:
-            pass  # Window was closed
+            return  # Window was closed
+        
+        for field in dirty:
+            dirty[field] = False
+    
+    def _on_hud_update(self):
+        """<<HUDUpdate>> handler (Tk thread): apply queued changes, then redraw."""
+        with self._state_lock:
+            while True:
+                try:
+                    field, value = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if field == 'batch':
+                    for name, item in value.items():
+                        self._apply(name, item)
+                elif field == 'visible':
+                    if value:
+                        self.root.deiconify()
+                    else:
+                        self.root.withdraw()
+                elif field == 'close':
+                    self.root.quit()  # _run_loop destroys the window once mainloop returns
+                    return
+                else:
+                    self._apply(field, value)
+        self._render_dirty()
+    
+    def _apply(self, field: str, value):
+        """Store one queued state change and flag the widgets it affects."""
+        if value == self._last[field]:
+            return
+        self._last[field] = value
+        if field == 'listening':
+            self.listening = value
+            self._dirty['indicator'] = self._dirty['status'] = True
+        elif field == 'status':
+            self.status_text = value
+            self._dirty['status'] = True
+        elif field == 'step':
+            self.step_num, self.total_steps, self.current_step = value
+            self._dirty['step'] = True
+        elif field == 'error':
+            self.error_msg = value
+            self._dirty['error'] = True
+    
+    def _post(self, field: str, value):
+        """Queue a state change and wake the Tk thread with one virtual event."""
+        with self._state_lock:
+            if not self.root:
+                # No Tk thread: store the state now; a window built later by
+                # show() renders it. visible/close only concern a live window.
+                if field == 'batch':
+                    for name, item in value.items():
+                        self._apply(name, item)
+                elif field not in ('visible', 'close'):
+                    self._apply(field, value)
+                return
+            self._q.put((field, value))
+        if not self._closing:
+            try:
+                self.root.event_generate('<<HUDUpdate>>', when='tail')
+            except (tk.TclError, RuntimeError):
+                pass  # Window not up yet or already closed; drained on the next update
     
     def _run_loop(self):
         """Run the Tkinter main loop in a thread."""
         self._create_window()
         self._running = True
-        self.root.mainloop()
+        self._ready.set()
+        root = self.root
+        root.mainloop()
+        try:
+            # Events still queued at shutdown must not reach a dead window
+            root.unbind('<<HUDUpdate>>')
+            root.destroy()
+        except tk.TclError:
+            pass
         self._running = False
     
     def show(self):
         """Show the HUD overlay."""
         if self._running:
-            if self.root:
-                self.root.deiconify()
+            self._post('visible', True)
             self.visible = True
             return
         
+        self._ready.clear()
+        self._closing = False
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         self.visible = True
-        time.sleep(0.2)  # Wait for window to appear
+        self._ready.wait(timeout=2.0)  # Until the window is built
     
     def hide(self):
         """Hide the HUD overlay."""
         if self.root:
-            try:
-                self.root.withdraw()
-            except:
-                pass
+            self._post('visible', False)
         self.visible = False
     
     def toggle(self):
@@ -181,35 +280,49 @@ class HUDOverlay:
             self.show()
     
     def destroy(self):
-        """Close the HUD."""
+        """Close the HUD (the window is torn down on its own thread). Safe to call twice."""
+        if self._closing:
+            return
         if self.root:
-            try:
-                self.root.quit()
-                self.root.destroy()
-            except:
-                pass
-        self.root = None
+            self._post('close', True)
+            self._closing = True
+            if self._thread and self._thread is not threading.current_thread():
+                self._thread.join(timeout=2.0)
+        with self._state_lock:
+            self.root = None
         self._running = False
     
-    # State update methods
+    # State update methods (thread-safe; applied on the Tk thread)
     def set_listening(self, listening: bool):
-        self.listening = listening
+        self._post('listening', listening)
     
     def set_status(self, status: str):
-        self.status_text = status
+        self._post('status', status)
     
     def set_step(self, step_num: int, total: int, description: str):
-        self.step_num = step_num
-        self.total_steps = total
-        self.current_step = description
+        self._post('step', (step_num, total, description))
     
     def set_error(self, error: Optional[str]):
-        self.error_msg = error or ""
+        self._post('error', error or "")
+    
+    def update(self, **fields):
+        """
+        Apply several state changes with a single <<HUDUpdate>>, e.g.
+        update(listening=False, message="Transcribing...").
+        step takes a (step_num, total, description) tuple.
+        """
+        unknown = set(fields) - self.UPDATE_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown HUD fields: {', '.join(sorted(unknown))}")
+        if 'message' in fields:
+            fields['status'] = fields.pop('message')
+        if 'error' in fields:
+            fields['error'] = fields['error'] or ""
+        if fields:
+            self._post('batch', fields)
     
     def clear_step(self):
-        self.step_num = 0
-        self.total_steps = 0
-        self.current_step = ""
+        self.set_step(0, 0, "")
 
 
 # Global instance
@@ -4,24 +4,41 @@ Keyboard hotkey handler with toggle PTT + Enter stop support.
 Proper PTT state reset after each command to accept new recordings.
 """
 
+import atexit
 import os
+import queue
 import threading
 import time
 import tkinter as tk
 from tkinter import simpledialog
 from pathlib import Path
-from datetime import datetime
 
 # Logging
 LOG_DIR = Path(__file__).parent.parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 DEBUG_LOG = LOG_DIR / "last_session_debug.log"
 
+# One buffered handle for the session instead of open/write/close per line;
+# flushed on errors and at exit
+try:
+    _LOG_FH = open(DEBUG_LOG, "a", encoding="utf-8", buffering=8192)
+    atexit.register(_LOG_FH.close)
+except OSError:
+    _LOG_FH = None
+_LOG_LOCK = threading.Lock()
+
 def log_debug(msg):
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    if _LOG_FH is None:
+        return
+    # time.time + integer millis: no datetime object per line
+    t = time.time()
+    ts = f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t))}.{int(t % 1 * 1000):03d}"
+    lowered = msg.lower()
     try:
-        with open(DEBUG_LOG, "a", encoding="utf-8") as f:
-            f.write(f"[{ts}] [Keyboard] {msg}\n")
+        with _LOG_LOCK:
+            _LOG_FH.write(f"[{ts}] [Keyboard] {msg}\n")
+            if "error" in lowered or "fail" in lowered:
+                _LOG_FH.flush()
     except:
         pass
 
@@ -32,11 +49,46 @@ except ImportError:
     keyboard = None
     KEYBOARD_AVAILABLE = False
 
+# Feedback channels, resolved once; a failed import is logged here, not per listener
+try:
+    from speech.local_tts import get_tts as _get_tts
+except Exception as e:
+    _get_tts = None
+    log_debug(f"TTS import failed: {e}")
+
+try:
+    from ui.hud import get_hud as _get_hud
+except Exception as e:
+    _get_hud = None
+    log_debug(f"HUD import failed: {e}")
+
 # Configuration
 PTT_MODE = os.getenv("PTT_MODE", "toggle")
 PTT_HOTKEY = os.getenv("PTT_HOTKEY", "ctrl+alt+space")
 PTT_STOP_KEY = os.getenv("PTT_STOP_KEY", "Enter").lower()
 TYPE_HOTKEY = os.getenv("TYPE_HOTKEY", "ctrl+alt+t")
+ENTER_DEBOUNCE_NS = 200_000_000  # Ignore Enter repeats within 200 ms
+
+# Typed-input dialogs all run on one daemon thread that owns a single hidden Tk
+# root, created on first use: a Tk interpreter must stay on the thread that made
+# it, and building one per Ctrl+Alt+T press is slow
+_input_root = None
+_input_queue = queue.SimpleQueue()
+_input_thread = None
+_input_thread_lock = threading.Lock()
+
+def _input_dialog_worker():
+    while True:
+        _input_queue.get()()
+
+def _run_on_input_thread(fn):
+    """Queue fn to run on the input dialog thread, starting it if needed."""
+    global _input_thread
+    with _input_thread_lock:
+        if _input_thread is None:
+            _input_thread = threading.Thread(target=_input_dialog_worker, daemon=True, name="input-dialog")
+            _input_thread.start()
+    _input_queue.put(fn)
 
 
 class KeyboardListener:
@@ -50,26 +102,28 @@ class KeyboardListener:
         self.asr = asr_engine
         self.ptt_mode = PTT_MODE
         self._running = False
+        self._stop_evt = threading.Event()  # Set by stop(); wakes waiters at once
         self._lock = threading.Lock()
         self._transcribing = False
         self._enter_hook = None
         self._ready_for_ptt = True  # New: explicit ready state
+        # Enter debounce: autorepeat while held fires the hook repeatedly
+        self._last_enter_ns = 0
+        self._enter_fired = False
+        # Modifier state kept current by key hooks (hold mode), so PTT key
+        # events don't query the OS keyboard state
+        self._mods = {'ctrl': False, 'alt': False}
 
         # TTS for feedback
         self._tts = None
-        try:
-            from speech.local_tts import get_tts
-            self._tts = get_tts()
-        except:
-            pass
+        if _get_tts:
+            try:
+                self._tts = _get_tts()
+            except Exception as e:
+                log_debug(f"TTS unavailable: {e}")
 
         # HUD for visual feedback
-        self._hud = None
-        try:
-            from ui.hud import get_hud
-            self._hud = get_hud()
-        except:
-            pass
+        self._hud = _get_hud() if _get_hud else None
         
         log_debug("KeyboardListener initialized")
 
@@ -82,30 +136,40 @@ class KeyboardListener:
                 pass
 
     def _update_hud(self, listening=None, error=None, message=None):
-        """Update HUD status."""
+        """Update HUD status (one batched HUD update per call)."""
         if self._hud:
+            fields = {}
+            if listening is not None:
+                fields['listening'] = listening
+            if error:
+                fields['error'] = error
+            if message:
+                fields['message'] = message
+            if not fields:
+                return
             try:
-                if listening is not None:
-                    self._hud.set_listening(listening)
-                if error:
-                    self._hud.set_error(error)
-                if message:
-                    self._hud.set_message(message)
+                self._hud.update(**fields)
             except:
                 pass
 
     def _open_input_box(self):
-        """Open a dialog for typed input."""
+        """Open a dialog for typed input (runs on the input dialog thread)."""
+        global _input_root
         try:
-            root = tk.Tk()
-            root.withdraw()
-            root.attributes('-topmost', True)
-            answer = simpledialog.askstring("AI Assistant", "Type a command:", parent=root)
-            root.destroy()
+            if _input_root is None:
+                _input_root = tk.Tk()
+                _input_root.withdraw()
+                _input_root.attributes('-topmost', True)
+            answer = simpledialog.askstring("AI Assistant", "Type a command:", parent=_input_root)
             if answer and answer.strip():
                 print(f'[Keyboard] Typed: {answer.strip()}')
                 log_debug(f"Typed input: {answer.strip()}")
                 self.callback(answer.strip())
+        except tk.TclError as e:
+            # Root unusable (e.g. destroyed); build a fresh one next time
+            _input_root = None
+            print(f"[Keyboard] Input dialog error: {e}")
+            log_debug(f"Input dialog error: {e}")
         except Exception as e:
             print(f"[Keyboard] Input dialog error: {e}")
             log_debug(f"Input dialog error: {e}")
@@ -116,6 +180,7 @@ class KeyboardListener:
             return
         try:
             self._stop_enter_listener()
+            self._enter_fired = False
             self._enter_hook = keyboard.on_press_key(
                 "enter",
                 lambda e: self._on_enter_pressed(),
@@ -138,9 +203,16 @@ class KeyboardListener:
             log_debug("Enter listener unregistered")
 
     def _on_enter_pressed(self):
-        """Handle Enter key press while recording."""
+        """Handle Enter key press while recording (first press only)."""
+        now = time.monotonic_ns()
+        if now - self._last_enter_ns < ENTER_DEBOUNCE_NS:
+            return
+        self._last_enter_ns = now
         with self._lock:
+            if self._enter_fired:
+                return
             if self.asr.is_recording() and not self._transcribing:
+                self._enter_fired = True
                 print("[Keyboard] Enter pressed - stopping recording...")
                 log_debug("Enter pressed - stopping recording")
                 self._do_stop_and_transcribe()
@@ -188,10 +260,11 @@ class KeyboardListener:
 
     def _check_mic_health(self):
         """Check for mic issues (no audio within 2s of starting)."""
-        time.sleep(2.0)
+        if self._stop_evt.wait(2.0):
+            return  # Listener stopped meanwhile
         with self._lock:
             if self.asr.is_recording() and not self._transcribing:
-                if hasattr(self.asr, '_frames') and len(self.asr._frames) < 5:
+                if self.asr.frames_captured() < 5:
                     print("[Keyboard] Mic health check: No audio frames detected!")
                     log_debug("Mic health check failed")
                     self._stop_enter_listener()
@@ -279,16 +352,22 @@ class KeyboardListener:
         """Handle type hotkey (Ctrl+Alt+T)."""
         print('[Keyboard] Type hotkey pressed')
         log_debug("Type hotkey pressed")
-        threading.Thread(target=self._open_input_box, daemon=True).start()
+        _run_on_input_thread(self._open_input_box)
 
     def _check_modifiers_and_ptt_down(self):
         """Check if modifiers are held and trigger PTT down (hold mode)."""
         try:
-            if keyboard.is_pressed('ctrl') and keyboard.is_pressed('alt'):
+            if self._mods['ctrl'] and self._mods['alt']:
                 self._on_ptt_hold_down()
         except:
             pass
 
+    def _track_modifiers(self):
+        """Hook Ctrl/Alt press and release to keep self._mods current."""
+        for mod in self._mods:
+            keyboard.on_press_key(mod, lambda e, m=mod: self._mods.__setitem__(m, True), suppress=False)
+            keyboard.on_release_key(mod, lambda e, m=mod: self._mods.__setitem__(m, False), suppress=False)
+
     def _check_modifiers_and_ptt_up(self):
         """Check modifiers and trigger PTT up (hold mode)."""
         try:
@@ -315,6 +394,7 @@ class KeyboardListener:
             return True
 
         self._running = True
+        self._stop_evt.clear()
         self._ready_for_ptt = True
         log_debug("Keyboard listener starting")
 
@@ -328,6 +408,7 @@ class KeyboardListener:
         # Register PTT hotkey based on mode
         try:
             if self.ptt_mode == "hold":
+                self._track_modifiers()
                 keyboard.on_press_key(
                     PTT_HOTKEY.split("+")[-1],
                     lambda e: self._check_modifiers_and_ptt_down(),
@@ -365,6 +446,7 @@ class KeyboardListener:
         except:
             pass
         self._running = False
+        self._stop_evt.set()
 
 
 # Global listener reference for re-initialization
@@ -383,9 +465,9 @@ def create_listener(callback, stt_or_asr):
     _listener = KeyboardListener(callback, asr)
 
     def run():
-        _listener.start()
-        while _listener._running:
-            time.sleep(0.1)
+        # Keep the thread alive until stop(), without waking up in between
+        if _listener.start():
+            _listener._stop_evt.wait()
 
     t = threading.Thread(target=run, daemon=True)
     t.start()
@@ -16,8 +16,33 @@ class TrayIcon:
         self.on_exit = on_exit
         self.icon = None
         self.running = False
+        # Only four states: render each icon once and swap the cached images
+        self._icon_cache = {}
+        if Image:
+            self._icon_cache = {c: self._render_icon(c) for c in ('green', 'red', 'yellow', 'blue')}
+        self._current_color = 'blue'
+        # Menu is static; build it once and reuse it across run() calls
+        self._menu = None
+        if pystray:
+            self._menu = pystray.Menu(
+                pystray.MenuItem("Start Assistant", self._on_start),
+                pystray.MenuItem("Stop Assistant", self._on_stop),
+                pystray.Menu.SEPARATOR,
+                pystray.MenuItem("Status", self._on_status),
+                pystray.Menu.SEPARATOR,
+                pystray.MenuItem("Exit", self._on_exit)
+            )
     
     def _create_icon_image(self, color='green'):
+        return self._icon_cache.get(color) or self._icon_cache['green']
+    
+    def _set_color(self, color):
+        # Reassigning icon.icon refreshes the shell tray icon; skip it when nothing changes
+        if self.icon and color != self._current_color:
+            self.icon.icon = self._create_icon_image(color)
+            self._current_color = color
+    
+    def _render_icon(self, color):
         # Create a simple colored circle icon
         size = 64
         image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
@@ -44,13 +69,13 @@ class TrayIcon:
     
     def _on_start(self, icon, item):
         self.running = True
-        icon.icon = self._create_icon_image('green')
+        self._set_color('green')
         if self.on_start:
             threading.Thread(target=self.on_start, daemon=True).start()
     
     def _on_stop(self, icon, item):
         self.running = False
-        icon.icon = self._create_icon_image('yellow')
+        self._set_color('yellow')
         if self.on_stop:
             self.on_stop()
     
@@ -69,20 +94,12 @@ class TrayIcon:
             print("[Tray] pystray or PIL not available, running without tray icon")
             return False
         
-        menu = pystray.Menu(
-            pystray.MenuItem("Start Assistant", self._on_start),
-            pystray.MenuItem("Stop Assistant", self._on_stop),
-            pystray.Menu.SEPARATOR,
-            pystray.MenuItem("Status", self._on_status),
-            pystray.Menu.SEPARATOR,
-            pystray.MenuItem("Exit", self._on_exit)
-        )
-        
+        self._current_color = 'blue'
         self.icon = pystray.Icon(
             "AI Assistant",
-            self._create_icon_image('blue'),
+            self._icon_cache['blue'],
             "AI Desktop Assistant",
-            menu
+            self._menu
         )
         
         print("[Tray] Starting system tray icon...")
@@ -97,8 +114,7 @@ class TrayIcon:
     
     def update_status(self, running):
         self.running = running
-        if self.icon:
-            self.icon.icon = self._create_icon_image('green' if running else 'yellow')
+        self._set_color('green' if running else 'yellow')
 
 
 def create_tray(on_start=None, on_stop=None, on_exit=None):
@@ -1,8 +1,16 @@
 # vision/ocr.py
-"""OCR wrapper using pytesseract for text extraction from images."""
+"""OCR wrapper using pytesseract (or tesserocr in-process) for text extraction from images."""
 
+import hashlib
 import os
 import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Sequence
 from PIL import Image
 
 try:
@@ -10,17 +18,43 @@ try:
 except ImportError:
     pytesseract = None
 
+# Tesseract C API binding: keeps the engine and traineddata loaded between
+# calls instead of spawning a tesseract process per image
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
 try:
-    import cv2
     import numpy as np
 except ImportError:
-    cv2 = None
     np = None
 
-from .screen_capture import capture_fullscreen, capture_region
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+if cv2 is not None:
+    # Explicitly enable OpenCV's SIMD paths and parallel_for_ pool (some builds
+    # default to one thread); CV2_THREADS overrides the worker count
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(int(os.getenv("CV2_THREADS", min(8, os.cpu_count() or 1))))
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from .screen_capture import capture_fullscreen, capture_region, get_current_frame
+from . import ocr_onnx
+
+# 'tesseract' (default) or 'onnx' for in-process RapidOCR (no subprocess per call)
+OCR_BACKEND = os.getenv("OCR_BACKEND", "tesseract").strip().lower()
 
 # Auto-detect Tesseract installation
 _tesseract_available = False
+_tessdata_dir = None  # For tesserocr when Tesseract isn't on PATH
 TESSERACT_PATHS = [
     r"C:\Program Files\Tesseract-OCR\tesseract.exe",
     r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
@@ -34,12 +68,198 @@ if pytesseract:
             if os.path.exists(path):
                 pytesseract.pytesseract.tesseract_cmd = path
                 _tesseract_available = True
+                _tessdata_dir = os.path.join(os.path.dirname(path), 'tessdata')
                 break
 
+TESSEROCR_MAX_CALLS = 500  # Rebuild an engine after this many images (bounds memory growth)
+_tess_tls = threading.local()  # tesserocr engines aren't thread-safe: one set per thread
+
+
+# OCR results keyed by image content: hashing a region takes a few ms, a
+# Tesseract run tens to hundreds, and UI regions are often re-read unchanged
+OCR_CACHE_SIZE = 256
+OCR_CACHE_MAX_BYTES = 16 * 1024 * 1024  # Don't hash frames larger than this
+OCR_MAX_SHORT_SIDE = 1600  # Larger captures are downscaled: far above Tesseract's ideal x-height
+MIN_BOX_CONF = 30  # Tesseract word confidence below this is treated as noise
+OCR_BATCH_CHUNK = 50  # Images per tesseract run; long lists can hang pytesseract
+_ocr_cache = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+
+
+def _image_digest(pil_image):
+    """Content hash of the image, or None if it's too large to be worth hashing."""
+    w, h = pil_image.size
+    if w * h * 4 > OCR_CACHE_MAX_BYTES:
+        return None
+    data = pil_image.tobytes()
+    if xxhash is not None:
+        digest = xxhash.xxh3_64_intdigest(data)
+    else:
+        digest = hashlib.blake2b(data, digest_size=8).digest()
+    return (pil_image.mode, pil_image.size, digest)
+
+
+def _cache_get(key):
+    with _ocr_cache_lock:
+        value = _ocr_cache.get(key)
+        if value is not None:
+            _ocr_cache.move_to_end(key)
+        return value
+
+
+def _cache_put(key, value):
+    with _ocr_cache_lock:
+        _ocr_cache[key] = value
+        _ocr_cache.move_to_end(key)
+        if len(_ocr_cache) > OCR_CACHE_SIZE:
+            _ocr_cache.popitem(last=False)
+
+
+def clear_cache():
+    """Drop all cached OCR results."""
+    with _ocr_cache_lock:
+        _ocr_cache.clear()
+
 
 def is_available() -> bool:
-    """Check if Tesseract OCR is available."""
-    return _tesseract_available and pytesseract is not None
+    """Check if Tesseract OCR is available (every entry point works with either binding)."""
+    return tesserocr is not None or (_tesseract_available and pytesseract is not None)
+
+
+def _tesserocr_run(pil_image, lang, read):
+    """Set pil_image on this thread's persistent tesserocr engine for lang; return read(api)."""
+    engines = getattr(_tess_tls, 'engines', None)
+    if engines is None:
+        engines = _tess_tls.engines = {}
+    entry = engines.get(lang)
+    if entry is None or entry[1] >= TESSEROCR_MAX_CALLS:
+        if entry is not None:
+            entry[0].End()
+        kwargs = {'path': _tessdata_dir} if _tessdata_dir else {}
+        entry = engines[lang] = [tesserocr.PyTessBaseAPI(lang=lang, **kwargs), 0]
+    
+    api = entry[0]
+    try:
+        api.SetImage(pil_image)
+        result = read(api)
+    except Exception:
+        # Don't reuse an engine in an unknown state
+        del engines[lang]
+        api.End()
+        raise
+    entry[1] += 1
+    return result
+
+
+def _tesserocr_text(pil_image, lang):
+    """OCR with this thread's persistent tesserocr engine for lang."""
+    return _tesserocr_run(pil_image, lang, lambda api: api.GetUTF8Text())
+
+
+def _tesserocr_words(api):
+    """Word boxes from a tesserocr engine, in pytesseract's image_to_data() dict layout."""
+    data = {name: [] for name in ('text', 'conf', 'left', 'top', 'width', 'height')}
+    api.Recognize()
+    iterator = api.GetIterator()
+    if iterator is None:
+        return data  # Nothing recognized
+    level = tesserocr.RIL.WORD
+    for word in tesserocr.iterate_level(iterator, level):
+        box = word.BoundingBox(level)
+        if box is None:
+            continue
+        x1, y1, x2, y2 = box
+        data['text'].append(word.GetUTF8Text(level) or '')
+        data['conf'].append(word.Confidence(level))
+        data['left'].append(x1)
+        data['top'].append(y1)
+        data['width'].append(x2 - x1)
+        data['height'].append(y2 - y1)
+    return data
+
+
+@contextmanager
+def _bmp_file(pil_image):
+    """
+    Write the image to a temporary BMP for the tesseract CLI. Handing pytesseract
+    a PIL image makes it PNG-encode it first (zlib, tens of ms on a full
+    screen); BMP is an uncompressed write.
+    """
+    if pil_image.mode not in ('1', 'L', 'RGB'):
+        pil_image = pil_image.convert('RGB')
+    fd, path = tempfile.mkstemp(prefix='ocr_', suffix='.bmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pil_image.save(f, 'BMP')
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _tesseract_text(pil_image, lang):
+    """
+    Run Tesseract on one image: in-process via tesserocr if installed, else the
+    CLI. The CLI also covers tesserocr failing at runtime (e.g. no tessdata).
+    """
+    if tesserocr is not None:
+        try:
+            return _tesserocr_text(pil_image, lang).strip()
+        except Exception as e:
+            if pytesseract is None:
+                raise
+            print(f"[OCR] tesserocr failed, using the tesseract CLI: {e}")
+    with _bmp_file(pil_image) as path:
+        return pytesseract.image_to_string(path, lang=lang).strip()
+
+
+def _tesseract_data(pil_image, lang):
+    """Word boxes for one image (image_to_data() dict); tesserocr first, like _tesseract_text."""
+    if tesserocr is not None:
+        try:
+            return _tesserocr_run(pil_image, lang, _tesserocr_words)
+        except Exception as e:
+            if pytesseract is None:
+                raise
+            print(f"[OCR] tesserocr failed, using the tesseract CLI: {e}")
+    with _bmp_file(pil_image) as path:
+        return pytesseract.image_to_data(path, lang=lang, output_type=pytesseract.Output.DICT)
+
+
+def _use_onnx() -> bool:
+    """Whether text extraction goes to the ONNX backend instead of Tesseract."""
+    return OCR_BACKEND == 'onnx' and ocr_onnx.is_available()
+
+
+def _preprocess_numpy(img_array):
+    """Grayscale + global threshold with plain numpy, for when OpenCV is missing."""
+    if img_array.ndim == 3:
+        # Fixed-point BT.601 luma, the same weights OpenCV's RGB2GRAY uses
+        gray = ((img_array[..., 0].astype(np.uint16) * 77
+                 + img_array[..., 1].astype(np.uint16) * 150
+                 + img_array[..., 2].astype(np.uint16) * 29) >> 8).astype(np.uint8)
+    else:
+        gray = img_array
+    binary = np.where(gray > gray.mean() - 10, 255, 0).astype(np.uint8)
+    return Image.fromarray(binary)
+
+
+def _downscale(pil_image):
+    """
+    Shrink images whose shorter side exceeds OCR_MAX_SHORT_SIDE (4K captures);
+    Tesseract time grows with pixel count and text there is already oversampled.
+    
+    Returns:
+        (image, scale) where scale maps original coordinates to the new image
+    """
+    w, h = pil_image.size
+    short = min(w, h)
+    if short <= OCR_MAX_SHORT_SIDE:
+        return pil_image, 1.0
+    scale = OCR_MAX_SHORT_SIDE / short
+    return pil_image.resize((round(w * scale), round(h * scale)), Image.LANCZOS), scale
 
 
 def preprocess_image(pil_image, enhance=True):
@@ -48,16 +268,20 @@ def preprocess_image(pil_image, enhance=True):
     
     Args:
         pil_image: PIL Image object
-        enhance: Whether to apply enhancement (grayscale, threshold)
+        enhance: Whether to apply enhancement (grayscale, threshold, median
+            denoise); 'strong' uses non-local-means denoising instead, which
+            is slower by orders of magnitude on full screens
     
     Returns:
         Preprocessed PIL Image
     """
-    if not enhance or cv2 is None or np is None:
+    if not enhance or np is None:
         return pil_image
     
-    # Convert to numpy array
-    img_array = np.array(pil_image)
+    # View the image as a numpy array (read-only; np.array would copy it twice)
+    img_array = np.asarray(pil_image)
+    if cv2 is None:
+        return _preprocess_numpy(img_array)
     
     # Convert to grayscale
     if len(img_array.shape) == 3:
@@ -65,13 +289,18 @@ def preprocess_image(pil_image, enhance=True):
     else:
         gray = img_array
     
-    # Apply adaptive thresholding for better text contrast
+    # Apply adaptive thresholding for better text contrast; the neighbourhood
+    # (odd, >= 11px) grows with resolution so text strokes stay inside it
+    block = max(11, (gray.shape[0] // 100) | 1)
     binary = cv2.adaptiveThreshold(
-        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block, 2
     )
     
-    # Denoise
-    denoised = cv2.fastNlMeansDenoising(binary, None, 10, 7, 21)
+    # Denoise: a 3x3 median removes speckle from the binary image
+    if enhance == 'strong':
+        denoised = cv2.fastNlMeansDenoising(binary, None, 10, 7, 21)
+    else:
+        denoised = cv2.medianBlur(binary, 3)
     
     return Image.fromarray(denoised)
 
@@ -83,29 +312,148 @@ def image_to_text(pil_image, lang='eng', enhance=True):
     Args:
         pil_image: PIL Image object
         lang: Tesseract language code (e.g., 'eng', 'hin', 'eng+hin')
-        enhance: Whether to preprocess image for better accuracy
+        enhance: Whether to preprocess image for better accuracy ('strong'
+            for heavier denoising)
     
     Returns:
         Extracted text as string
     """
-    if pytesseract is None:
+    onnx = _use_onnx()
+    if pytesseract is None and tesserocr is None and not onnx:
         raise ImportError("pytesseract not installed. Run: pip install pytesseract")
     
-    # Preprocess for better OCR
-    processed = preprocess_image(pil_image, enhance)
+    digest = _image_digest(pil_image)
+    key = ('text', lang, enhance, digest)
+    if digest is not None:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+    
+    if onnx:
+        # The detector works on the raw color image; no Tesseract-style binarization
+        try:
+            text = ocr_onnx.image_to_text(pil_image)
+        except Exception as e:
+            print(f"[OCR] ONNX backend error: {e}")
+            return ""
+        if digest is not None:
+            _cache_put(key, text)
+        return text
+    
+    # Downscale oversized captures, then preprocess for better OCR
+    scaled, _ = _downscale(pil_image)
+    processed = preprocess_image(scaled, enhance)
     
     try:
-        text = pytesseract.image_to_string(processed, lang=lang)
-        return text.strip()
+        text = _tesseract_text(processed, lang)
     except Exception as e:
         print(f"[OCR] Error: {e}")
         # Try without preprocessing as fallback
         try:
-            text = pytesseract.image_to_string(pil_image, lang=lang)
-            return text.strip()
+            text = _tesseract_text(scaled, lang)
         except Exception as e2:
             print(f"[OCR] Fallback also failed: {e2}")
             return ""
+    
+    if digest is not None:
+        _cache_put(key, text)
+    return text
+
+
+def _screen_image():
+    """Current screen as a PIL image, sharing the frame template matching uses."""
+    if cv2 is None or np is None:
+        return capture_fullscreen()
+    return get_current_frame().to_pil()
+
+
+def _ocr_chunk(images, lang):
+    """OCR several images with one tesseract process via a list-of-files input."""
+    with tempfile.TemporaryDirectory(prefix='ocr_') as tmp:
+        paths = []
+        for i, img in enumerate(images):
+            path = os.path.join(tmp, f"{i}.bmp")
+            if img.mode not in ('1', 'L', 'RGB'):
+                img = img.convert('RGB')
+            img.save(path, 'BMP')  # Uncompressed: no PNG encode per image
+            paths.append(path)
+        list_path = os.path.join(tmp, 'list.txt')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(paths) + '\n')
+        output = pytesseract.image_to_string(list_path, lang=lang)
+    
+    # Tesseract ends every page with a form feed
+    pages = [page.strip() for page in output.split('\x0c')]
+    if len(pages) < len(images):
+        raise RuntimeError(f"expected {len(images)} pages, got {len(pages)}")
+    return pages[:len(images)]
+
+
+def image_to_text_batch(pil_images, lang='eng', enhance=True):
+    """
+    Extract text from several PIL Images, paying tesseract's startup and
+    language-model load once per chunk instead of once per image.
+    
+    Args:
+        pil_images: Sequence of PIL Image objects
+        lang: Tesseract language code
+        enhance: Whether to preprocess images for better accuracy
+    
+    Returns:
+        List of extracted strings, in the same order as pil_images
+    """
+    onnx = _use_onnx()
+    if pytesseract is None and tesserocr is None and not onnx:
+        raise ImportError("pytesseract not installed. Run: pip install pytesseract")
+    
+    results = [None] * len(pil_images)
+    pending = []  # (index, key) of images not in the cache
+    for i, img in enumerate(pil_images):
+        digest = _image_digest(img)
+        key = ('text', lang, enhance, digest) if digest is not None else None
+        cached = _cache_get(key) if key else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, key))
+    if not pending:
+        return results
+    
+    if onnx:
+        # One in-process pass; ONNX Runtime already spreads inference over cores
+        chunks = [pending]
+    else:
+        chunks = [pending[i:i + OCR_BATCH_CHUNK] for i in range(0, len(pending), OCR_BATCH_CHUNK)]
+    
+    def run(chunk):
+        images = [pil_images[i] for i, _ in chunk]
+        if onnx:
+            try:
+                return ocr_onnx.image_to_text_batch(images)
+            except Exception as e:
+                print(f"[OCR] ONNX backend error: {e}")
+                return [""] * len(images)
+        if tesserocr is not None:
+            # Engine is already loaded in-process; no startup to amortize
+            return [image_to_text(img, lang=lang, enhance=enhance) for img in images]
+        try:
+            return _ocr_chunk([preprocess_image(_downscale(img)[0], enhance) for img in images], lang)
+        except Exception as e:
+            print(f"[OCR] Batch failed, falling back to one call per image: {e}")
+            return [image_to_text(img, lang=lang, enhance=enhance) for img in images]
+    
+    if len(chunks) == 1:
+        texts = [run(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(chunks), os.cpu_count() or 1)) as pool:
+            texts = list(pool.map(run, chunks))
+    
+    for chunk, chunk_texts in zip(chunks, texts):
+        for (i, key), text in zip(chunk, chunk_texts):
+            results[i] = text
+            if key is not None:
+                _cache_put(key, text)
+    return results
 
 
 def extract_text_from_screen(lang='eng'):
@@ -118,7 +466,7 @@ def extract_text_from_screen(lang='eng'):
     Returns:
         Extracted text as string
     """
-    img = capture_fullscreen()
+    img = _screen_image()
     return image_to_text(img, lang=lang)
 
 
@@ -138,41 +486,128 @@ def extract_text_from_region(x, y, w, h, lang='eng'):
     return image_to_text(img, lang=lang)
 
 
-def get_text_with_positions(pil_image, lang='eng'):
+@dataclass
+class TextBoxes:
     """
-    Extract text with bounding box positions.
+    OCR word boxes as parallel columns (numpy arrays when numpy is available,
+    else lists) rather than one dict per word. Shared with the OCR cache, so
+    treat as read-only.
+    """
+    text: Sequence[str]
+    x: Sequence[int]
+    y: Sequence[int]
+    w: Sequence[int]
+    h: Sequence[int]
+    conf: Sequence[int]
+    
+    def __len__(self):
+        return len(self.text)
+    
+    def to_dicts(self, indices=None):
+        """List of {'text', 'x', 'y', 'w', 'h', 'conf'} dicts, optionally only for indices."""
+        if indices is None:
+            indices = range(len(self.text))
+        return [
+            {
+                'text': self.text[i],
+                'x': int(self.x[i]),
+                'y': int(self.y[i]),
+                'w': int(self.w[i]),
+                'h': int(self.h[i]),
+                'conf': int(self.conf[i])
+            }
+            for i in indices
+        ]
+
+
+_NO_BOXES = TextBoxes([], [], [], [], [], [])
+
+
+def _boxes_from_data(data, scale=1.0):
+    """
+    Keep the non-empty, confident words of an image_to_data() dict, mapping
+    boxes back to original coordinates if the image was downscaled by scale.
+    """
+    texts = [t.strip() for t in data['text']]
+    if np is not None:
+        conf = np.asarray(data['conf'], dtype=np.float64).astype(np.int32)
+        mask = (conf > MIN_BOX_CONF) & np.fromiter(map(bool, texts), dtype=bool, count=len(texts))
+        keep = np.flatnonzero(mask)
+        
+        def column(name):
+            values = np.asarray(data[name])[keep]
+            return values if scale == 1.0 else np.rint(values / scale).astype(np.int64)
+        
+        return TextBoxes(
+            text=np.asarray(texts, dtype=object)[keep],
+            x=column('left'),
+            y=column('top'),
+            w=column('width'),
+            h=column('height'),
+            conf=conf[keep],
+        )
+    
+    conf = [int(float(c)) for c in data['conf']]
+    keep = [i for i, t in enumerate(texts) if t and conf[i] > MIN_BOX_CONF]
+    
+    def column(name):
+        return [round(data[name][i] / scale) for i in keep]
+    
+    return TextBoxes(
+        text=[texts[i] for i in keep],
+        x=column('left'),
+        y=column('top'),
+        w=column('width'),
+        h=column('height'),
+        conf=[conf[i] for i in keep],
+    )
+
+
+def get_text_boxes(pil_image, lang='eng'):
+    """
+    Extract confident words with their bounding boxes, as columns.
     
     Args:
         pil_image: PIL Image object
         lang: Tesseract language code
     
     Returns:
-        List of dicts with 'text', 'x', 'y', 'w', 'h', 'conf' keys
+        TextBoxes (empty on OCR error)
     """
-    if pytesseract is None:
+    if pytesseract is None and tesserocr is None:
         raise ImportError("pytesseract not installed")
     
+    digest = _image_digest(pil_image)
+    key = ('positions', lang, digest)
+    if digest is not None:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+    
     try:
-        data = pytesseract.image_to_data(pil_image, lang=lang, output_type=pytesseract.Output.DICT)
-        
-        results = []
-        n_boxes = len(data['text'])
-        for i in range(n_boxes):
-            text = data['text'][i].strip()
-            conf = int(data['conf'][i])
-            if text and conf > 30:  # Filter low-confidence and empty
-                results.append({
-                    'text': text,
-                    'x': data['left'][i],
-                    'y': data['top'][i],
-                    'w': data['width'][i],
-                    'h': data['height'][i],
-                    'conf': conf
-                })
-        return results
+        scaled, scale = _downscale(pil_image)
+        boxes = _boxes_from_data(_tesseract_data(scaled, lang), scale)
     except Exception as e:
         print(f"[OCR] Error getting positions: {e}")
-        return []
+        return _NO_BOXES
+    
+    if digest is not None:
+        _cache_put(key, boxes)
+    return boxes
+
+
+def get_text_with_positions(pil_image, lang='eng'):
+    """
+    Extract text with bounding box positions.
+    
+    Args:
+        pil_image: PIL Image object
+        lang: Tesseract language code
+    
+    Returns:
+        List of dicts with 'text', 'x', 'y', 'w', 'h', 'conf' keys
+    """
+    return get_text_boxes(pil_image, lang).to_dicts()
 
 
 def find_text_on_screen(search_text, lang='eng'):
@@ -186,13 +621,11 @@ def find_text_on_screen(search_text, lang='eng'):
     Returns:
         List of matching positions with bounding boxes, or empty list if not found
     """
-    img = capture_fullscreen()
-    all_text = get_text_with_positions(img, lang)
+    img = _screen_image()
+    boxes = get_text_boxes(img, lang)
     
+    # Match on the text column; build dicts only for the hits
     search_lower = search_text.lower()
-    matches = [
-        item for item in all_text
-        if search_lower in item['text'].lower()
-    ]
+    hits = [i for i, text in enumerate(boxes.text) if search_lower in text.lower()]
     
-    return matches
+    return boxes.to_dicts(hits)
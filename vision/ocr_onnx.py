@@ -0,0 +1,59 @@
+# vision/ocr_onnx.py
+"""In-process OCR backend using RapidOCR (DBNet + CRNN ONNX models on ONNX Runtime)."""
+
+import threading
+
+try:
+    import numpy as np
+    from rapidocr_onnxruntime import RapidOCR
+except ImportError:
+    np = None
+    RapidOCR = None
+
+# One engine per process: loading the ONNX models is the expensive part
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def is_available() -> bool:
+    """Check if rapidocr-onnxruntime is installed."""
+    return RapidOCR is not None
+
+
+def _get_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            print("[OCR] Loading RapidOCR ONNX models...")
+            _engine = RapidOCR()
+        return _engine
+
+
+def image_to_text(pil_image):
+    """
+    Extract text from a PIL Image, one detected line per output line.
+    
+    Args:
+        pil_image: PIL Image object
+    
+    Returns:
+        Extracted text as string
+    """
+    if RapidOCR is None:
+        raise ImportError("rapidocr-onnxruntime not installed. Run: pip install rapidocr-onnxruntime")
+    
+    result, _ = _get_engine()(np.asarray(pil_image.convert('RGB')))
+    if not result:
+        return ""
+    # Each result entry is [box, text, score]
+    return "\n".join(text for _, text, _ in result).strip()
+
+
+def image_to_text_batch(pil_images):
+    """
+    Extract text from several PIL Images with the shared engine.
+    
+    Returns:
+        List of extracted strings, in the same order as pil_images
+    """
+    return [image_to_text(img) for img in pil_images]
@@ -1,18 +1,70 @@
 # vision/screen_capture.py
 """Fast cross-platform screen capture using mss."""
 
+import atexit
 import os
+import queue
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
 from PIL import Image
 
 try:
     import mss
     import mss.tools
+    from mss.exception import ScreenShotError
 except ImportError:
     mss = None
+    ScreenShotError = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+# ScreenCaptureKit-backed grabber on macOS: maps the frame from unified memory
+# instead of going through CGWindowListCreateImage like mss does
+macss = None
+if sys.platform == 'darwin':
+    try:
+        from macss import macss
+    except ImportError:
+        macss = None
 
 SNAPSHOTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs', 'snapshots')
 
+# zlib level for saved PNGs: 1 encodes several times faster than PIL's default
+# 6 for a somewhat larger file
+PNG_COMPRESS_LEVEL = 1
+
+# Background PNG writer for background=True saves; bounded so a slow disk
+# applies backpressure instead of buffering frames without limit
+_save_q = queue.Queue(maxsize=32)
+_writer_thread = None
+_writer_lock = threading.Lock()
+
+# One mss instance per thread, kept open between captures (mss handles can't
+# be shared across threads, and opening one costs a display/DC setup)
+_TLS = threading.local()
+
+# Most recent get_current_frame() result, shared so OCR and template matching
+# in the same tick reuse one grab
+_frame_lock = threading.Lock()
+_last_frame = None
+
+# Workers for capture_all_monitors(); long-lived so each keeps its mss instance
+_monitor_pool = None
+_monitor_pool_size = 0
+_monitor_pool_lock = threading.Lock()
+
 
 def ensure_snapshots_dir():
     """Ensure snapshots directory exists."""
@@ -20,13 +72,115 @@ def ensure_snapshots_dir():
     return SNAPSHOTS_DIR
 
 
-def capture_fullscreen(save_path=None, monitor_index=1):
+def _writer_loop():
+    while True:
+        img, path = _save_q.get()
+        try:
+            img.save(path, 'PNG', compress_level=PNG_COMPRESS_LEVEL)
+        except Exception as e:
+            print(f"[Capture] Failed to save {path}: {e}")
+        finally:
+            _save_q.task_done()
+
+
+def _save_png(img, path, background=False):
+    """Save img as PNG now, or queue it for the writer thread."""
+    ensure_snapshots_dir()
+    if not background:
+        img.save(path, 'PNG', compress_level=PNG_COMPRESS_LEVEL)
+        return
+    
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_writer_loop, name='png-writer', daemon=True)
+            _writer_thread.start()
+    _save_q.put((img, path))
+
+
+def flush():
+    """Block until every queued background save has been written."""
+    if _writer_thread is not None:
+        _save_q.join()
+
+
+atexit.register(flush)  # The writer is a daemon thread; don't drop queued frames on exit
+
+
+def _get_macss():
+    """This thread's persistent macss grabber, or None when it isn't usable."""
+    global macss
+    if macss is None:
+        return None
+    grabber = getattr(_TLS, 'macss', None)
+    if grabber is None:
+        try:
+            grabber = _TLS.macss = macss()
+        except Exception as e:
+            print(f"[Capture] macss unavailable, using mss: {e}")
+            macss = None
+    return grabber
+
+
+def _get_sct():
+    """Return this thread's persistent mss instance, creating it on first use."""
+    sct = getattr(_TLS, 'sct', None)
+    if sct is None:
+        sct = _TLS.sct = mss.mss()
+    return sct
+
+
+def close():
+    """Release this thread's mss instance; the next capture opens a new one."""
+    sct = getattr(_TLS, 'sct', None)
+    _TLS.sct = None
+    if sct is not None:
+        try:
+            sct.close()
+        except Exception:
+            pass
+
+
+def _grab(area, fresh=False):
+    """
+    Grab a monitor (int index into sct.monitors) or a region dict.
+    
+    fresh=True uses a throwaway mss instance instead of the cached one, for
+    callers that fork or otherwise can't keep a handle around.
+    """
+    def grab(sct):
+        return sct.grab(sct.monitors[area] if isinstance(area, int) else area)
+    
+    if fresh:
+        with mss.mss() as sct:
+            return grab(sct)
+    try:
+        return grab(_get_sct())
+    except ScreenShotError:
+        # Cached handle went stale (display change, session unlock); reopen once
+        close()
+        return grab(_get_sct())
+
+
+def _to_pil(sct_img):
+    """RGB PIL image from an mss screenshot (copies and drops the padding byte)."""
+    return Image.frombytes('RGB', sct_img.size, sct_img.bgra, 'raw', 'BGRX')
+
+
+def _to_ndarray(sct_img):
+    """(h, w, 4) uint8 BGRA view over the screenshot's own buffer, no copy."""
+    return np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(sct_img.height, sct_img.width, 4)
+
+
+def capture_fullscreen(save_path=None, monitor_index=1, fresh=False, background=False):
     """
     Capture the full screen (primary monitor by default).
     
     Args:
         save_path: Optional path to save PNG. If None, generates timestamped path.
         monitor_index: Which monitor to capture (1 = primary, 0 = all monitors combined)
+        fresh: Use a new mss instance instead of this thread's cached one
+        background: Return before the PNG is written (see flush())
     
     Returns:
         PIL.Image object of the captured screen
@@ -34,21 +188,120 @@ def capture_fullscreen(save_path=None, monitor_index=1):
     if mss is None:
         raise ImportError("mss not installed. Run: pip install mss")
     
-    with mss.mss() as sct:
-        monitor = sct.monitors[monitor_index]
-        sct_img = sct.grab(monitor)
-        
-        # Convert to PIL Image
-        img = Image.frombytes('RGB', sct_img.size, sct_img.bgra, 'raw', 'BGRX')
-        
-        if save_path:
-            ensure_snapshots_dir()
-            img.save(save_path, 'PNG')
-        
-        return img
-
-
-def capture_region(x, y, w, h, save_path=None):
+    sct_img = _grab(monitor_index, fresh)
+    
+    # Convert to PIL Image
+    img = _to_pil(sct_img)
+    
+    if save_path:
+        _save_png(img, save_path, background)
+    
+    return img
+
+
+def capture_fullscreen_np(monitor_index=1, fresh=False):
+    """
+    Capture a monitor as a BGRA numpy array, skipping the PIL conversion.
+    
+    Returns:
+        numpy.ndarray of shape (height, width, 4), dtype uint8, BGRA order
+        (ready for cv2 BGRA2GRAY / BGRA2BGR)
+    """
+    global macss
+    if mss is None:
+        raise ImportError("mss not installed. Run: pip install mss")
+    if np is None:
+        raise ImportError("numpy not installed. Run: pip install numpy")
+    
+    grabber = None if fresh else _get_macss()
+    if grabber is not None:
+        try:
+            return np.asarray(grabber.grab(_get_sct().monitors[monitor_index]))
+        except Exception as e:
+            print(f"[Capture] macss grab failed, falling back to mss: {e}")
+            macss = None
+    return _to_ndarray(_grab(monitor_index, fresh))
+
+
+def _get_monitor_pool(workers):
+    global _monitor_pool, _monitor_pool_size
+    with _monitor_pool_lock:
+        if _monitor_pool is None or _monitor_pool_size != workers:
+            if _monitor_pool is not None:
+                _monitor_pool.shutdown(wait=False)  # Monitor count changed
+            _monitor_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='capture')
+            _monitor_pool_size = workers
+        return _monitor_pool
+
+
+def capture_all_monitors():
+    """
+    Capture every monitor at once, one worker thread (and mss instance) per
+    monitor; the native copies release the GIL, so grabs overlap.
+    
+    Returns:
+        dict of monitor index (1-based, as in sct.monitors) -> BGRA numpy array
+    """
+    if mss is None:
+        raise ImportError("mss not installed. Run: pip install mss")
+    if np is None:
+        raise ImportError("numpy not installed. Run: pip install numpy")
+    
+    indices = range(1, len(_get_sct().monitors))
+    if len(indices) == 1:
+        return {1: _to_ndarray(_grab(1))}
+    
+    pool = _get_monitor_pool(len(indices))
+    frames = pool.map(lambda i: _to_ndarray(_grab(i)), indices)
+    return dict(zip(indices, frames))
+
+
+@dataclass
+class ScreenFrame:
+    """One captured monitor frame; color conversions are computed once, on demand."""
+    bgra: "np.ndarray"
+    monitor_index: int
+    timestamp: float  # time.monotonic() at capture
+    
+    @cached_property
+    def gray(self):
+        return cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2GRAY)
+    
+    @cached_property
+    def bgr(self):
+        return cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2BGR)
+    
+    @cached_property
+    def rgb(self):
+        return cv2.cvtColor(self.bgra, cv2.COLOR_BGRA2RGB)
+    
+    def to_pil(self):
+        """RGB PIL image of the frame."""
+        return Image.fromarray(self.rgb)
+
+
+def get_current_frame(max_age_ms=16, monitor_index=1):
+    """
+    Return a recent capture of the monitor, grabbing a new one only if the
+    cached frame is older than max_age_ms (or from another monitor).
+    
+    Returns:
+        ScreenFrame
+    """
+    global _last_frame
+    if cv2 is None:
+        raise ImportError("opencv-python not installed. Run: pip install opencv-python-headless")
+    
+    with _frame_lock:
+        frame = _last_frame
+        now = time.monotonic()
+        if (frame is None or frame.monitor_index != monitor_index
+                or now - frame.timestamp > max_age_ms / 1000):
+            frame = _last_frame = ScreenFrame(capture_fullscreen_np(monitor_index), monitor_index, now)
+        return frame
+
+
+def capture_region(x, y, w, h, save_path=None, fresh=False, background=False):
     """
     Capture a specific region of the screen.
     
@@ -56,6 +309,8 @@ def capture_region(x, y, w, h, save_path=None):
         x, y: Top-left corner coordinates
         w, h: Width and height of region
         save_path: Optional path to save PNG
+        fresh: Use a new mss instance instead of this thread's cached one
+        background: Return before the PNG is written (see flush())
     
     Returns:
         PIL.Image object of the captured region
@@ -63,23 +318,22 @@ def capture_region(x, y, w, h, save_path=None):
     if mss is None:
         raise ImportError("mss not installed. Run: pip install mss")
     
-    with mss.mss() as sct:
-        region = {"left": x, "top": y, "width": w, "height": h}
-        sct_img = sct.grab(region)
-        
-        # Convert to PIL Image
-        img = Image.frombytes('RGB', sct_img.size, sct_img.bgra, 'raw', 'BGRX')
-        
-        if save_path:
-            ensure_snapshots_dir()
-            img.save(save_path, 'PNG')
-        
-        return img
+    region = {"left": x, "top": y, "width": w, "height": h}
+    sct_img = _grab(region, fresh)
+    
+    # Convert to PIL Image
+    img = _to_pil(sct_img)
+    
+    if save_path:
+        _save_png(img, save_path, background)
+    
+    return img
 
 
 def capture_with_timestamp(prefix="screen"):
     """
-    Capture fullscreen with automatic timestamped filename.
+    Capture fullscreen with automatic timestamped filename. The PNG is
+    written in the background; call flush() before reading it back.
     
     Returns:
         tuple: (PIL.Image, save_path)
@@ -87,7 +341,7 @@ def capture_with_timestamp(prefix="screen"):
     ensure_snapshots_dir()
     timestamp = int(time.time() * 1000)
     save_path = os.path.join(SNAPSHOTS_DIR, f"{prefix}_{timestamp}.png")
-    img = capture_fullscreen(save_path)
+    img = capture_fullscreen(save_path, background=True)
     return img, save_path
 
 
@@ -96,14 +350,13 @@ def list_monitors():
     if mss is None:
         return []
     
-    with mss.mss() as sct:
-        return [
-            {
-                "index": i,
-                "left": m["left"],
-                "top": m["top"],
-                "width": m["width"],
-                "height": m["height"]
-            }
-            for i, m in enumerate(sct.monitors)
-        ]
+    return [
+        {
+            "index": i,
+            "left": m["left"],
+            "top": m["top"],
+            "width": m["width"],
+            "height": m["height"]
+        }
+        for i, m in enumerate(_get_sct().monitors)
+    ]
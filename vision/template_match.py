@@ -1,6 +1,7 @@
 # vision/template_match.py
 """Template matching for finding UI elements by image."""
 
+import functools
 import os
 from PIL import Image
 
@@ -11,10 +12,24 @@ except ImportError:
     cv2 = None
     np = None
 
-from .screen_capture import capture_fullscreen
+if cv2 is not None:
+    # Explicitly enable OpenCV's SIMD paths and parallel_for_ pool (some builds
+    # default to one thread); CV2_THREADS overrides the worker count
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(int(os.getenv("CV2_THREADS", min(8, os.cpu_count() or 1))))
+
+from .screen_capture import get_current_frame
 
 TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'templates')
 
+# Coarse-to-fine search for find_template_on_screen: match on a downscaled
+# pyramid level first, then only re-check the best coarse hits at full size
+PYRAMID_LEVELS = 2         # Each level halves width and height
+PYRAMID_MIN_TEMPLATE = 32  # Smaller templates lose too much detail; match at full size
+PYRAMID_TOP_K = 5          # Coarse hits refined at full resolution
+PYRAMID_COARSE_RELAX = 0.9 # Coarse hits must score threshold * this (downscaling blurs)
+PYRAMID_EXPAND = 8         # Pixels of slack around each coarse hit
+
 
 def ensure_templates_dir():
     """Ensure templates directory exists."""
@@ -22,7 +37,92 @@ def ensure_templates_dir():
     return TEMPLATES_DIR
 
 
-def find_template_on_screen(template_path, threshold=0.8, grayscale=True):
+@functools.lru_cache(maxsize=64)
+def _load_template(path, mtime_ns, grayscale):
+    """Decode a template once per file version; the array is shared, so read-only."""
+    template = cv2.imread(path, cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR)
+    if template is not None:
+        template.setflags(write=False)
+    return template
+
+
+def load_template(template_path, grayscale=True):
+    """
+    Load a template image, reusing the decoded array while the file is unchanged.
+    
+    Returns:
+        numpy.ndarray (grayscale or BGR), or None if missing/unreadable
+    """
+    try:
+        mtime_ns = os.stat(template_path).st_mtime_ns
+    except OSError:
+        return None
+    return _load_template(template_path, mtime_ns, grayscale)
+
+
+def _match_scores(screen, template, sqdiff):
+    """Match response map, oriented so higher is always better."""
+    if sqdiff:
+        return 1.0 - cv2.matchTemplate(screen, template, cv2.TM_SQDIFF_NORMED)
+    return cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+
+
+def _match_best(screen, template, sqdiff=False, threshold=None, full_res_fallback=False):
+    """
+    Best match of template in screen, scored with TM_CCOEFF_NORMED, or with
+    1 - TM_SQDIFF_NORMED if sqdiff (no mean subtraction; a little cheaper).
+    
+    Only coarse hits scoring at least threshold * PYRAMID_COARSE_RELAX are
+    refined, so a miss costs the coarse pass alone. With full_res_fallback,
+    a miss is re-checked by matching the whole screen at full resolution.
+    
+    Returns:
+        (score, (x, y)) in full-resolution screen coordinates; score is -1.0
+        if no coarse hit cleared the relaxed threshold
+    """
+    th, tw = template.shape[:2]
+    if min(th, tw) < PYRAMID_MIN_TEMPLATE:
+        _, max_val, _, max_loc = cv2.minMaxLoc(_match_scores(screen, template, sqdiff))
+        return max_val, max_loc
+    
+    screen_p, template_p = screen, template
+    for _ in range(PYRAMID_LEVELS):
+        screen_p = cv2.pyrDown(screen_p)
+        template_p = cv2.pyrDown(template_p)
+    scale = 2 ** PYRAMID_LEVELS
+    coarse = _match_scores(screen_p, template_p, sqdiff)
+    
+    # Refine the top-K distinct coarse peaks above the relaxed threshold.
+    # After each pick, a template-sized window around it is masked out so the
+    # next pick isn't just a neighbouring pixel of the same blob.
+    floor = -np.inf if threshold is None else threshold * PYRAMID_COARSE_RELAX
+    peaks = []
+    tph, tpw = template_p.shape[:2]
+    for _ in range(PYRAMID_TOP_K):
+        _, peak_val, _, (px, py) = cv2.minMaxLoc(coarse)
+        if peak_val == -np.inf or peak_val < floor:
+            break
+        peaks.append((px, py))
+        coarse[max(py - tph // 2, 0):py + tph // 2 + 1, max(px - tpw // 2, 0):px + tpw // 2 + 1] = -np.inf
+    
+    sh, sw = screen.shape[:2]
+    best_val, best_loc = -1.0, (0, 0)
+    for px, py in peaks:
+        x0 = min(max(px * scale - PYRAMID_EXPAND, 0), sw - tw)
+        y0 = min(max(py * scale - PYRAMID_EXPAND, 0), sh - th)
+        x1 = min(px * scale + tw + PYRAMID_EXPAND, sw)
+        y1 = min(py * scale + th + PYRAMID_EXPAND, sh)
+        _, max_val, _, max_loc = cv2.minMaxLoc(_match_scores(screen[y0:y1, x0:x1], template, sqdiff))
+        if max_val > best_val:
+            best_val, best_loc = max_val, (x0 + max_loc[0], y0 + max_loc[1])
+    
+    if full_res_fallback and (threshold is None or best_val < threshold):
+        _, best_val, _, best_loc = cv2.minMaxLoc(_match_scores(screen, template, sqdiff))
+    return best_val, best_loc
+
+
+def find_template_on_screen(template_path, threshold=0.8, grayscale=True, method='ccoeff',
+                            full_res_fallback=False):
     """
     Find a template image on the current screen.
     
@@ -30,6 +130,11 @@ def find_template_on_screen(template_path, threshold=0.8, grayscale=True):
         template_path: Path to template image file
         threshold: Match confidence threshold (0.0-1.0)
         grayscale: Whether to convert to grayscale for matching
+        method: 'ccoeff' (TM_CCOEFF_NORMED, tolerant of brightness shifts) or
+            'sqdiff' (1 - TM_SQDIFF_NORMED, slightly cheaper; for pixel-exact UI.
+            Unrelated regions still score ~0.7, so use a threshold near 0.95)
+        full_res_fallback: On a miss, also match the whole screen at full size
+            (catches matches the downscaled pass blurs away; slower misses)
     
     Returns:
         Dict with 'x', 'y', 'w', 'h', 'score', 'center_x', 'center_y' if found,
@@ -42,25 +147,21 @@ def find_template_on_screen(template_path, threshold=0.8, grayscale=True):
         print(f"[TemplateMatch] Template not found: {template_path}")
         return None
     
-    # Capture screen
-    screen_img = capture_fullscreen()
-    screen = np.array(screen_img)
-    screen = cv2.cvtColor(screen, cv2.COLOR_RGB2BGR)
+    # Capture screen (reuses a frame grabbed within the last few ms)
+    frame = get_current_frame()
     
-    # Load template
-    template = cv2.imread(template_path)
+    # Load template (decoded straight to grayscale if requested, cached per file version)
+    template = load_template(template_path, grayscale)
     if template is None:
         print(f"[TemplateMatch] Failed to load template: {template_path}")
         return None
     
-    # Convert to grayscale if requested
-    if grayscale:
-        screen = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+    # Single-pass BGRA -> gray/BGR conversion of the screen, cached on the frame
+    screen = frame.gray if grayscale else frame.bgr
     
-    # Template matching
-    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    # Template matching (coarse-to-fine for large enough templates)
+    max_val, max_loc = _match_best(screen, template, sqdiff=(method == 'sqdiff'), threshold=threshold,
+                                   full_res_fallback=full_res_fallback)
     
     if max_val >= threshold:
         th, tw = template.shape[:2]
@@ -97,55 +198,61 @@ def find_all_templates(template_path, threshold=0.8, max_results=10, grayscale=T
     if not os.path.exists(template_path):
         return []
     
-    # Capture screen
-    screen_img = capture_fullscreen()
-    screen = np.array(screen_img)
-    screen = cv2.cvtColor(screen, cv2.COLOR_RGB2BGR)
+    # Capture screen (reuses a frame grabbed within the last few ms)
+    frame = get_current_frame()
     
-    # Load template
-    template = cv2.imread(template_path)
+    # Load template (decoded straight to grayscale if requested, cached per file version)
+    template = load_template(template_path, grayscale)
     if template is None:
         return []
     
     th, tw = template.shape[:2]
     
-    # Convert to grayscale if requested
-    if grayscale:
-        screen = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+    # Single-pass BGRA -> gray/BGR conversion of the screen, cached on the frame
+    screen = frame.gray if grayscale else frame.bgr
     
     # Template matching
     result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
     
-    # Find all locations above threshold
-    locations = np.where(result >= threshold)
+    # Find all locations above threshold, best first
+    ys, xs = np.nonzero(result >= threshold)
+    scores = result[ys, xs]
+    order = np.argsort(-scores, kind='stable')
+    
+    # Greedy suppression: keep a point unless a better one already kept lies
+    # within half a template of it. Kept points are bucketed on a grid of that
+    # size, so each check only looks at the 3x3 neighbouring cells.
+    half_w, half_h = tw // 2, th // 2
+    cell_w, cell_h = max(half_w, 1), max(half_h, 1)
+    grid = {}
     matches = []
     
-    for pt in zip(*locations[::-1]):
-        tx, ty = pt
-        score = result[ty, tx]
-        
-        # Check for overlap with existing matches (avoid duplicates)
-        is_duplicate = False
-        for existing in matches:
-            if abs(existing['x'] - tx) < tw // 2 and abs(existing['y'] - ty) < th // 2:
-                is_duplicate = True
-                break
+    for k in order:
+        tx, ty = int(xs[k]), int(ys[k])
+        cx, cy = tx // cell_w, ty // cell_h
+        is_duplicate = any(
+            abs(ex - tx) < half_w and abs(ey - ty) < half_h
+            for gx in (cx - 1, cx, cx + 1)
+            for gy in (cy - 1, cy, cy + 1)
+            for ex, ey in grid.get((gx, gy), ())
+        )
+        if is_duplicate:
+            continue
         
-        if not is_duplicate:
-            matches.append({
-                "x": int(tx),
-                "y": int(ty),
-                "w": tw,
-                "h": th,
-                "score": float(score),
-                "center_x": tx + tw // 2,
-                "center_y": ty + th // 2
-            })
-    
-    # Sort by score and limit results
-    matches.sort(key=lambda m: m['score'], reverse=True)
-    return matches[:max_results]
+        grid.setdefault((cx, cy), []).append((tx, ty))
+        matches.append({
+            "x": tx,
+            "y": ty,
+            "w": tw,
+            "h": th,
+            "score": float(scores[k]),
+            "center_x": tx + tw // 2,
+            "center_y": ty + th // 2
+        })
+        if len(matches) >= max_results:
+            break
+    
+    return matches
 
 
 def save_template_from_region(x, y, w, h, name):